@@ -1,3 +1,31 @@
+import multiprocessing
+import sys
+
+startup_profile = None
+
+if __name__ == "__main__":
+    # Frozen builds re-launch the executable for process pool workers
+    multiprocessing.freeze_support()
+
+    if "--batch" in sys.argv[1:]:
+        # Headless export, dispatched before anything from Textual is imported
+        from batch_export import main as batch_main
+
+        sys.argv.remove("--batch")
+        sys.exit(batch_main(sys.argv[1:]))
+
+    profile_args = [arg for arg in sys.argv[1:] if arg.split("=", 1)[0] == "--startup-profile"]
+    if profile_args:
+        # Started before the imports below, which are most of the cold start
+        from startup_profile import StartupProfile
+
+        # --startup-profile=FILE also writes the timings as JSON, to compare builds
+        startup_profile = StartupProfile(profile_args[0].partition("=")[2] or None).start()
+        for arg in profile_args:
+            sys.argv.remove(arg)
+
+# Only what the first frame needs is imported here; ifcopenshell, NumPy, openpyxl and the extraction and
+# export modules are imported on first use, or by the warm-up once the first frame is shown (see _warm_up)
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.binding import Binding
@@ -8,24 +36,35 @@ from widgets._ifcPsets import PsetWidget
 from widgets._appname import AppNameWidget
 from widgets._systemInfo import SystemInfoWidget
 from widgets._ifcParams import ParamsWidget
-from widgets._logbox import LogBox
+from widgets._logbox import LogBox, WARNING, ERROR
 from widgets._ifcInfo import IfcInfoWidget
 from widgets._footer import FooterBox
 from widgets._statusBar import StatusWidget
 from widgets._ifcStatus import IfcStatus
-from widgets._appInfo import InfoModal
-from widgets._themeModal import ThemeSelectorModal
+from widgets._timingsPanel import TimingsPanel
 
-import ifcopenshell
 import asyncio
+import functools
+import importlib
 import time
 from datetime import datetime
 from pathlib import Path
 from honeyThemes import nightbee, choosenbee, barbee, farbee, daybee, beethoven, cyberhive
 
 from config_manager import ConfigManager
+from folder_scanner import HeaderSummaries
+from index_cache import IndexCache, build_model_summary
+from step_scanner import scan_header, scan_preview
+from model_pool import ModelPool, ModelSession
+from model_server import ModelServer
+from job_manager import CancelToken, JobCancelled, JobManager
+from op_timings import OperationTimings
 import os
-import sys
+
+# Imported in the background after the first frame, in the order opening a model needs them
+WARM_UP_MODULES = ("ifcopenshell", "ifcopenshell.util.element", "property_table", "extraction", "property_index",
+                   "element_headers", "parallel_extraction", "streaming_model", "exporters", "openpyxl",
+                   "widgets._appInfo")
 
 
 class VerticalLayoutExample(App):
@@ -42,7 +81,10 @@ class VerticalLayoutExample(App):
     BINDINGS = [
         Binding("p", "toggle_fullscreen", "Toggle Parameters Fullscreen"),
         Binding("g", "toggle_log", "Toggle log widget"),
-        Binding("e", "export_xlsx", "Export selected parameters to XLSX"),
+        Binding("e", "export", "Export selected parameters"),
+        Binding("x", "toggle_export_modal", "Select export format and export"),
+        Binding("c", "cancel_export", "Cancel running export"),
+        Binding("w", "export_model", "Export the whole model to one workbook"),
         Binding("1", "focus_file_explorer", "Focus File Explorer"),
         Binding("2", "focus_category_widget", "Focus Category Widget"),
         Binding("3", "focus_pset_widget", "Focus Pset Widget"),
@@ -50,6 +92,8 @@ class VerticalLayoutExample(App):
         Binding("i", "toggle_info_modal", "Show Info Modal"),
         Binding("q", "quit", "Quit App"),
         Binding("t", "toggle_theme_modal", "Select Theme"),
+        Binding("o", "toggle_timings", "Toggle operation timings"),
+        Binding("d", "dump_timings", "Save operation timings as JSON"),
     ]
 
     def get_theme_variable_defaults(self) -> dict[str, str]:
@@ -60,8 +104,10 @@ class VerticalLayoutExample(App):
         for theme in (nightbee, choosenbee, barbee, farbee, daybee, beethoven, cyberhive):
             self.register_theme(theme)
 
-    def __init__(self):
+    def __init__(self, startup_profile=None):
         super().__init__()
+        # Cold-start timings, only with --startup-profile; the app quits once the warm-up is done
+        self.startup_profile = startup_profile
         self.ifc_file = None
         self.ifc_filename = None
         self.ifc_filepath = None
@@ -73,6 +119,49 @@ class VerticalLayoutExample(App):
         self.config_manager = ConfigManager("honeycomb")
         self.saved_theme = self.config_manager.get_theme()
 
+        self.model_session = None
+        self.model_summary = None
+        self._open_task = None
+        self._index_task = None
+        self.index_cache = IndexCache(
+            self.config_manager.get_cache_dir(),
+            max_size_mb=self.config_manager.get_cache_max_size_mb(),
+            max_entries=self.config_manager.get_cache_max_entries(),
+        )
+        self.model_pool = ModelPool(self.config_manager.get_model_budget_mb())
+        # Models too big to parse are answered from indexes built by streaming the file, see streaming_model.py
+        self.low_memory_mode = self.config_manager.get_low_memory_mode()
+        self.stream_model = None
+        # Optional worker process that owns the models instead of this one, see model_server.py
+        self.model_server = None
+        self.server_model = None
+        # Big categories are extracted by forked processes, see parallel_extraction.py
+        self.parallel_workers = self.config_manager.get_parallel_workers()
+        self.parallel_min_elements = self.config_manager.get_parallel_min_elements()
+        if self.config_manager.get_model_server_enabled():
+            self.model_server = ModelServer(self.config_manager.get_model_budget_mb(), self.parallel_workers,
+                                            self.parallel_min_elements)
+            # Started before Textual redirects stdout/stderr, which process spawning needs
+            self.model_server.start()
+        self.jobs = JobManager(
+            max_workers=self.config_manager.get_job_workers(),
+            on_progress=lambda text: self.status_widget.log(f"[~~~] {text}"),
+            on_error=lambda slot, error: self.log_box.log(f"Job {slot} failed: {str(error)}", ERROR),
+        )
+
+        # Duration, counts and peak RSS of every open, pset fetch, extraction and export, see op_timings.py
+        self.timings = OperationTimings(history=self.config_manager.get_timings_history(),
+                                        enabled=self.config_manager.get_timings_enabled())
+
+        # Warn when the opened model is rewritten or removed, see on_browser_widget_files_changed
+        self.flag_changed_model = self.config_manager.get_browser_flag_changed_model()
+
+        # Speculative work for the highlighted rows, see _prefetch_params
+        self.prefetch_enabled = self.config_manager.get_prefetch_enabled()
+        self._prefetch_task = None
+        self._prefetch_key = None
+        self._last_pset = None
+
     def compose(self) -> ComposeResult:
         with Vertical():
             with Horizontal(classes='TopRow') as top_row:
@@ -92,8 +181,14 @@ class VerticalLayoutExample(App):
 
             with Horizontal(classes='MiddleRow'):
                 with Vertical(classes="IfcFiles"):
-                    self.file_explorer = BrowserWidget()
+                    self.file_explorer = BrowserWidget(recursive=self.config_manager.get_browser_recursive(),
+                                                       watch=self.config_manager.get_browser_watch(),
+                                                       poll_interval=self.config_manager.get_browser_poll_interval(),
+                                                       summaries=HeaderSummaries(
+                                                           self.config_manager.get_cache_dir(),
+                                                           self.config_manager.get_browser_header_workers()))
                     self.file_explorer.border_title = r"FileExplorer \[1]"
+                    self.file_explorer.border_subtitle = r"\[r] - Refresh, \[s] - Subfolders"
                     self.file_explorer.can_focus = True
                     yield self.file_explorer
 
@@ -104,7 +199,7 @@ class VerticalLayoutExample(App):
 
                 with Vertical(classes="IfcProperties"):
                     self.category_widget = CategoryWidget()
-                    self.category_widget.border_title = r"IfcCategories \[2]"
+                    self.category_widget.border_title = CategoryWidget.CATEGORY_TITLE
                     self.category_widget.can_focus = True
                     #self.category_widget.border_subtitle = "c - Expand"
                     yield self.category_widget
@@ -114,9 +209,9 @@ class VerticalLayoutExample(App):
                     self.pset_widget.can_focus = True
                     yield self.pset_widget
 
-                self.params_widget = ParamsWidget()
+                self.params_widget = ParamsWidget(table_cache_size=self.config_manager.get_table_cache_size())
                 self.params_widget.border_title = r"IfcProperties \[4]"
-                self.params_widget.border_subtitle = r"\[p] - Expand, \[e] - Export in xlsx"
+                self.params_widget.border_subtitle = r"\[p] - Expand, \[e] - Export, \[x] - Export as..., \[c] - Cancel export"
                 self.params_widget.can_focus = True
                 yield self.params_widget
             
@@ -124,7 +219,16 @@ class VerticalLayoutExample(App):
             self.status_widget.border_title = "Status"
             yield self.status_widget
 
-            self.log_box = LogBox()
+            self.timings_panel = TimingsPanel(self.timings)
+            self.timings_panel.border_title = "Operation timings"
+            self.timings_panel.border_subtitle = r"\[o] - Hide, \[d] - Save as JSON"
+            self.timings_panel.display = False
+            yield self.timings_panel
+
+            log_file = self.config_manager.get_log_file()
+            self.log_box = LogBox(level=self.config_manager.get_log_level(),
+                                  max_lines=self.config_manager.get_log_max_lines(),
+                                  log_file=str(log_file) if log_file else None)
             self.log_box.border_title = "Log"
             self.log_box.display = False
             yield self.log_box
@@ -135,11 +239,49 @@ class VerticalLayoutExample(App):
         self.theme = self.saved_theme
         self.set_focus(self.file_explorer)
         self.log_box.log("Application started")
-        self.log_box.log("Main App: Mounted")
+        self.log_box.debug("Main App: Mounted")
+        if self.model_server is not None:
+            self.log_box.log("Model server process started")
         self.status_widget.log("")
 
         # Schedule a timer to update the title with the current time every second
         self.set_interval(1, self.update_top_row_title)
+        if self.startup_profile is not None:
+            self.startup_profile.mark("mounted")
+        self.call_after_refresh(self._on_first_paint)
+
+    def _on_first_paint(self) -> None:
+        if self.startup_profile is not None:
+            self.startup_profile.mark("first paint")
+            self.startup_profile.stop_imports()
+        self.jobs.spawn("warmup", self._warm_up())
+
+    async def _warm_up(self) -> None:
+        """Imports the modules of the first model while the user is still picking a file"""
+        try:
+            timings = await self.jobs.run("warmup", None, self._import_modules, WARM_UP_MODULES)
+        except JobCancelled:
+            return
+        self.log_box.debug(f"Warm-up: {len(timings)} modules imported in {sum(timings.values()):.2f} seconds")
+
+        if self.startup_profile is not None:
+            for module, seconds in timings.items():
+                self.startup_profile.record_warm_up(module, seconds)
+            self.startup_profile.mark("warm-up done")
+            self.action_quit()
+
+    @staticmethod
+    def _import_modules(modules: tuple, token: CancelToken) -> dict:
+        """Import time of each module not imported yet; a module imported meanwhile by a job is just waited for"""
+        timings = {}
+        for module in modules:
+            token.check()
+            if module in sys.modules:
+                continue
+            start_time = time.perf_counter()
+            importlib.import_module(module)
+            timings[module] = time.perf_counter() - start_time
+        return timings
 
     def update_top_row_title(self) -> None:
         current_time = datetime.now().strftime("%H:%M:%S")
@@ -147,15 +289,22 @@ class VerticalLayoutExample(App):
         self.refresh()
 
     def action_toggle_info_modal(self) -> None:
+        from widgets._appInfo import InfoModal
+
         if self.is_screen_installed("info_modal"):
             self.pop_screen()
         else:
             self.push_screen(InfoModal())
 
 
-    async def on_browser_widget_file_selected(self, message: BrowserWidget.FileSelected) -> None:
+    def on_browser_widget_file_selected(self, message: BrowserWidget.FileSelected) -> None:
         self.log_box.log(f"File selected: {message.filename}")
         self.ifc_filename = message.filename
+        self.ifc_file = None
+        self.model_session = None
+        self.server_model = None
+        self.stream_model = None
+        self.model_summary = None
         self.selected_category = None
         self.selected_pset = None  # Clear previous selections
 
@@ -166,72 +315,383 @@ class VerticalLayoutExample(App):
         self.params_widget.pset = None
         self.params_widget.update_view()
 
-        try:
-            status_widget = self.query_one(StatusWidget)
-            status_widget.log("[~~~] Opening Ifc... [0.0 sec]")
-
-            start_time = time.perf_counter()
+        # Work for the previous model is stale now
+        self.jobs.cancel("psets", "params", "open", "prefetch")
+        self._open_task = None
+        self._index_task = None
+        self._prefetch_key = None
+        self.params_widget.table_cache.clear()
+        self.jobs.spawn("model", self._load_model(message.filename))
+
+    def on_browser_widget_files_changed(self, message: BrowserWidget.FilesChanged) -> None:
+        """Flags the opened model when its file changes; the new version is read when it is selected again"""
+        if not self.flag_changed_model or not self.ifc_filename:
+            return
+        changes = message.changes
+        name = os.path.normcase(os.path.normpath(self.ifc_filename))
+        if any(os.path.normcase(path) == name for path in changes.removed):
+            self.log_box.log(f"{self.ifc_filename} was removed from disk, the loaded version is still shown",
+                             WARNING)
+            self.status_widget.log(f"[!!!] {self.ifc_filename} was removed from disk")
+        elif any(os.path.normcase(file_entry.path) == name for file_entry in changes.changed + changes.added):
+            self.log_box.log(f"{self.ifc_filename} changed on disk, select it again to load the new version",
+                             WARNING)
+            self.status_widget.log(f"[!!!] {self.ifc_filename} changed on disk, select it again to reload")
+
+    async def _load_model(self, filename: str) -> None:
+        status_widget = self.query_one(StatusWidget)
+
+        session = self.model_pool.get(filename)
+        if session is not None and session.summary is not None:
+            # Recently opened model: still in memory, nothing to parse
+            self.model_session = session
+            self.ifc_file = session.ifc_file
+            self.model_summary = session.summary
+            self._show_model_summary(filename)
+            self.log_box.log(f"{filename} reused from memory ({len(self.model_pool)} models open)")
+            status_widget.log(f"[OK] {filename} reused from memory")
+            return
 
-            # Create a task to open the file in the background
-            open_task = asyncio.create_task(asyncio.to_thread(ifcopenshell.open, message.filename))
-
-            # Run a loop to update the counter while the file is being opened
-            async def update_counter():
-                while not open_task.done():
-                    elapsed_time = time.perf_counter() - start_time
-                    status_widget.log(f"[~~~] Opening Ifc... [{elapsed_time:.1f} sec]")
-                    await asyncio.sleep(0.5)
-
-            await asyncio.gather(open_task, update_counter())
-
-            self.ifc_file = open_task.result()
-
-            elapsed_time = time.perf_counter() - start_time
-            self.log_box.log(f"IFC file loaded successfully in {elapsed_time:.2f} seconds")
-            status_widget.log(f"[OK] IFC opened in {elapsed_time:.2f} seconds")
-
-            # Update the UI with the loaded IFC data
-            self.ifc_info_widget.update_info(self.ifc_file, message.filename)
-            self.category_widget.update_categories(self.ifc_file, message.filename)
+        try:
+            summary = await asyncio.to_thread(self.index_cache.get, filename)
+        except Exception as e:
+            self.log_box.log(f"Index cache lookup failed: {str(e)}", WARNING)
+            summary = None
 
-            # Clear the IfcStatus widget and update it with the new file name
-            self.query_one(IfcStatus).update_status(ifc_name=message.filename, category=None, pset=None)
+        if summary:
+            # The full parse is deferred until parameters are actually requested
+            self.model_summary = summary
+            self._show_model_summary(filename)
+            self.log_box.log(f"Index of {filename} loaded from cache")
+            status_widget.log(f"[OK] {filename} index loaded from cache")
+            return
 
+        try:
+            # The raw STEP scan usually finishes long before the parse and fills the panes meanwhile;
+            # streaming a model takes about as long as the scan, so it is not scanned twice
+            preview_task = None
+            if not self._use_streaming(filename):
+                preview_task = asyncio.create_task(self._show_preview(filename))
+            try:
+                await self._open_ifc_file(filename)
+            finally:
+                if preview_task is not None:
+                    preview_task.cancel()
+
+            if self.model_summary is None:
+                with self.timings.measure("categories", filename) as measurement:
+                    property_index = await self._ensure_property_index()
+                    self.model_summary = await self.jobs.run("summary", "Indexing model", build_model_summary,
+                                                             self.ifc_file, property_index)
+                    measurement.elements = self.model_summary["products"]
+                    measurement.rows = len(self.model_summary["categories"])
+            self.model_summary["header"] = await asyncio.to_thread(scan_header, filename)
+            self._show_model_summary(filename)
+            if self.model_session is not None:
+                self.model_session.summary = self.model_summary
+
+            await asyncio.to_thread(self.index_cache.put, filename, self.model_summary)
+            self.log_box.log(f"Index of {filename} stored in cache")
+
+        except JobCancelled:
+            self.log_box.log(f"Loading of {filename} cancelled")
         except Exception as e:
-            self.log_box.log(f"Error loading IFC file: {str(e)}")
+            self.log_box.log(f"Error loading IFC file: {str(e)}", ERROR)
             status_widget.log(f"[ERROR] Failed to open IFC file: {str(e)}")
 
+    @staticmethod
+    def _parse_ifc_file(filename: str, token: CancelToken):
+        import ifcopenshell
+
+        token.check()
+        return ifcopenshell.open(filename)
+
+    async def _open_ifc_file(self, filename: str) -> None:
+        """Fully parses the IFC file in the background, progress is reported by the job manager"""
+        status_widget = self.query_one(StatusWidget)
+        start_time = time.perf_counter()
+
+        with self.timings.measure("open", filename) as measurement:
+            if self._use_streaming(filename):
+                from streaming_model import StreamingModel
+
+                self.stream_model = await self.jobs.run("open", "Streaming Ifc (low-memory mode)",
+                                                        StreamingModel.build, filename)
+                if self.model_summary is None:
+                    self.model_summary = await asyncio.to_thread(self.stream_model.summary)
+            elif self.model_server is not None:
+                # Parsed and indexed in the server process; the summary comes back with it unless it is known
+                summary = await self.jobs.run("open", "Opening Ifc", self.model_server.open, filename,
+                                              summary=self.model_summary is None)
+                if summary is not None:
+                    self.model_summary = summary
+                self.server_model = filename
+            else:
+                self.ifc_file = await self.jobs.run("open", "Opening Ifc", self._parse_ifc_file, filename)
+            # A first parse in this process learns the element count only from the category count after it
+            measurement.elements = self.model_summary["products"] if self.model_summary else None
+
+        elapsed_time = time.perf_counter() - start_time
+        mode = " in low-memory mode" if self.stream_model is not None else ""
+        self.log_box.log(f"IFC file loaded successfully{mode} in {elapsed_time:.2f} seconds")
+        status_widget.log(f"[OK] IFC opened{mode} in {elapsed_time:.2f} seconds")
+        if self.model_server is not None or self.stream_model is not None:
+            return
+
+        self.model_session = ModelSession(filename, self.ifc_file)
+        self.model_session.summary = self.model_summary
+        for evicted_path in self.model_pool.add(self.model_session):
+            self.log_box.log(f"Model {evicted_path} released from memory (RSS budget exceeded)")
+
+    async def _show_preview(self, filename: str) -> None:
+        """Shows approximate counts from a raw STEP scan while the file is still being parsed"""
+        try:
+            preview = await self.jobs.run("preview", "Scanning STEP data",
+                                          lambda path, token: scan_preview(path, token.tick), filename)
+        except JobCancelled:
+            return
+        except Exception as e:
+            self.log_box.log(f"Preview scan failed: {str(e)}", WARNING)
+            return
+
+        if not self._model_open() and filename == self.ifc_filename:
+            self.ifc_info_widget.update_info(None, filename, schema=preview["schema"],
+                                             num_elements=preview["products"], header=preview["header"],
+                                             approximate=True)
+            self.category_widget.update_categories(None, filename, categories=preview["categories"],
+                                                   approximate=True)
+            self.log_box.log(f"Preview of {filename}: {len(preview['categories'])} categories")
+
+    def _use_streaming(self, filename: str) -> bool:
+        """Whether a file is opened in low-memory mode rather than parsed"""
+        if self.low_memory_mode in ("always", "never"):
+            return self.low_memory_mode == "always"
+        from streaming_model import needs_streaming
 
-    async def on_category_widget_category_selected(self, message: CategoryWidget.CategorySelected) -> None:
+        try:
+            return needs_streaming(filename)
+        except OSError:
+            return False
+
+    def _model_open(self) -> bool:
+        """Whether the selected file is parsed, in this process or in the model server, or streamed"""
+        if self.stream_model is not None:
+            return self.stream_model.path == self.ifc_filename
+        if self.model_server is not None:
+            return self.server_model is not None and self.server_model == self.ifc_filename
+        return self.ifc_file is not None
+
+    async def _ensure_ifc_file(self) -> bool:
+        """Opens the selected file if only its cached index has been loaded so far"""
+        if not self._model_open() and self.ifc_filename:
+            # A newer Pset selection must not restart a parse that is already running
+            if self._open_task is None or self._open_task.done():
+                self._open_task = self.jobs.spawn("open", self._open_ifc_file(self.ifc_filename))
+            try:
+                await asyncio.shield(self._open_task)
+            except JobCancelled:
+                pass
+            except Exception as e:
+                self.query_one(StatusWidget).log(f"[ERROR] Failed to open IFC file: {str(e)}")
+        return self._model_open()
+
+    async def _ensure_property_index(self):
+        """Builds the property definition index of the opened model once, in the background"""
+        session = self.model_session
+        if "properties" in session.indexes:
+            return session.indexes["properties"]
+        # Shared like the parse, so a selection joins a build started by prefetching instead of restarting it
+        if self._index_task is None or self._index_task.done():
+            self._index_task = asyncio.ensure_future(
+                self.jobs.run("index", "Indexing property sets", session.get_property_index))
+        return await asyncio.shield(self._index_task)
+
+    async def _ensure_element_headers(self):
+        """Element header store of the opened model; seeding it from the summary is kept off the UI thread"""
+        session = self.model_session
+        if "headers" in session.indexes:
+            return session.indexes["headers"]
+        return await asyncio.to_thread(session.get_element_headers)
+
+    def _show_model_summary(self, filename: str) -> None:
+        """Updates the info and category panes from the model summary"""
+        summary = self.model_summary
+        self.ifc_info_widget.update_info(None, filename, schema=summary["schema"], num_elements=summary["products"],
+                                         header=summary.get("header"))
+        self.category_widget.update_categories(self.ifc_file, filename, categories=summary["categories"],
+                                               pset_counts=summary.get("pset_counts"))
+
+        # Clear the IfcStatus widget and update it with the new file name
+        self.query_one(IfcStatus).update_status(ifc_name=filename, category=None, pset=None)
+
+    def on_category_widget_category_selected(self, message: CategoryWidget.CategorySelected) -> None:
         self.selected_category = message.category
         self.selected_pset = None  # Reset the selected property set when a new category is selected
         self.log_box.log(f"Main App: Category selected: {self.selected_category}")
 
         # Reset the ParamsWidget to its initial state
+        self.jobs.cancel("params")
         self.params_widget.pset = None
         self.params_widget.update_view()
 
-        if self.ifc_file and self.selected_category:
-            self.log_box.log(f"Main App: Updating PsetWidget with category {self.selected_category}")
-            
-            # Properly await the async `update_psets` function
-            await self.pset_widget.update_psets(self.ifc_file, self.selected_category)
-            
-            # Update the IfcStatus widget with the selected category and clear the property set
+        if self.model_summary and self.selected_category:
+            self.log_box.debug(f"Main App: Updating PsetWidget with category {self.selected_category}")
+            self.jobs.cancel("psets")
+            psets = self.model_summary["psets"].get(self.selected_category, [])
+            self.pset_widget.show_psets(self.selected_category, psets)
             self.query_one(IfcStatus).update_status(ifc_name=self.ifc_filename, category=self.selected_category, pset=None)
+            self._prefetch_likely_pset(self.selected_category, psets)
+
+        elif self._model_open() and self.selected_category:
+            self.log_box.debug(f"Main App: Updating PsetWidget with category {self.selected_category}")
+            self.jobs.spawn("psets", self._load_psets(self.selected_category))
         else:
-            self.log_box.log(f"Main App: IFC file exists: {self.ifc_file is not None}, Category: {self.selected_category}")
+            self.log_box.debug(f"Main App: IFC file exists: {self.ifc_file is not None}, Category: {self.selected_category}")
+            if self.ifc_filename and self.selected_category:
+                self.query_one(StatusWidget).log("[~~~] Preview counts only, the model is still being opened...")
+
+    async def _load_psets(self, category: str) -> None:
+        with self.timings.measure("psets", category) as measurement:
+            property_index = await self._ensure_property_index()
+            psets = property_index.pset_names(category)
+            measurement.rows = len(psets)
+        self.pset_widget.show_psets(category, psets, "property index")
+
+        # Update the IfcStatus widget with the selected category and clear the property set
+        self.query_one(IfcStatus).update_status(ifc_name=self.ifc_filename, category=category, pset=None)
+        self._prefetch_likely_pset(category, psets)
+
+    def on_category_widget_category_highlighted(self, message: CategoryWidget.CategoryHighlighted) -> None:
+        """The cursor rests on a category: get its pset list ready and, if the model is parsed, its likely table"""
+        if not self.prefetch_enabled or message.category == self.selected_category:
+            return
+        if self.model_summary:
+            psets = self.model_summary["psets"].get(message.category, [])
+            self._prefetch_likely_pset(message.category, psets, open_model=False)
+        elif self._model_open():
+            self.jobs.spawn("prefetch", self._prefetch_psets(message.category))
+
+    def on_pset_widget_pset_highlighted(self, message: PsetWidget.PsetHighlighted) -> None:
+        if self.prefetch_enabled:
+            self._spawn_prefetch(message.category, message.pset)
+
+    def _params_key(self, category: str, pset: str, psets: list = None) -> tuple:
+        return self.ifc_filename, category, tuple(psets or [pset])
+
+    def _prefetch_likely_pset(self, category: str, psets: list, open_model: bool = True) -> None:
+        """Prepares the pset picked last time if the category has it, otherwise its first pset"""
+        if not self.prefetch_enabled or not psets:
+            return
+        pset = self._last_pset if self._last_pset in psets else psets[0]
+        self._spawn_prefetch(category, pset, open_model)
+
+    def _spawn_prefetch(self, category: str, pset: str, open_model: bool = True) -> None:
+        key = self._params_key(category, pset)
+        if key in self.params_widget.table_cache:
+            return
+        if key == self._prefetch_key and self._prefetch_task is not None and not self._prefetch_task.done():
+            return
+        if self.jobs.is_busy("params") or self.jobs.is_busy("export"):
+            # Speculation never competes with work that was asked for
+            return
+        self._prefetch_key = key
+        self._prefetch_task = self.jobs.spawn("prefetch", self._prefetch_params(key, category, pset, open_model))
+
+    async def _prefetch_psets(self, category: str) -> None:
+        property_index = await self._ensure_property_index()
+        self._prefetch_likely_pset(category, property_index.pset_names(category), open_model=False)
+
+    async def _prefetch_params(self, key: tuple, category: str, pset: str, open_model: bool) -> None:
+        """Extracts a table nobody has asked for yet into the params cache; superseded by any newer prefetch.
+
+        The job runs unlabelled, so it stays out of the status line, and checks its token every chunk,
+        so abandoning it costs at most one chunk of work.
+        """
+        if not self._model_open() and not open_model:
+            return
+        if not await self._ensure_ifc_file():
+            return
+        if self.stream_model is not None:
+            # Every table of a streamed model is another pass over the whole file
+            return
+        from extraction import OptimizedIFCDataProcessor
+
+        source = await self._table_source(category, pset)
+
+        start_time = time.perf_counter()
+        try:
+            with self.timings.measure("params", f"{category} / {pset} (prefetch)") as measurement:
+                table = await self.jobs.run("prefetch", None, OptimizedIFCDataProcessor.collect_table, source)
+                measurement.elements = measurement.rows = len(table)
+        except JobCancelled:
+            self.log_box.debug(f"Prefetch of {category} with {pset} abandoned")
+            return
+
+        if len(table) and key[0] == self.ifc_filename:
+            self.params_widget.cache_table(key, table)
+            self.log_box.debug(f"Prefetched {category} with {pset}: {len(table)} rows in "
+                               f"{time.perf_counter() - start_time:.2f} seconds")
+
+    def on_category_widget_pset_selected(self, message: CategoryWidget.PsetSelected) -> None:
+        """Pset-first mode: one pset over every element that carries it, whatever its class"""
+        self.selected_category = CategoryWidget.ALL_CATEGORIES
+        self.selected_pset = message.pset
+        self.log_box.log(f"Main App: Pset selected across categories: {self.selected_pset}")
 
+        # The pset pane has nothing to offer for a pset chosen directly
+        self.jobs.cancel("psets", "params")
+        self.pset_widget.category = None
+        self.pset_widget.update_view()
+        self.jobs.spawn("params", self._load_params(CategoryWidget.ALL_CATEGORIES, self.selected_pset))
 
-    async def on_pset_widget_pset_selected(self, message: PsetWidget.PsetSelected) -> None:
+    def on_pset_widget_pset_selected(self, message: PsetWidget.PsetSelected) -> None:
         self.selected_pset = message.pset
+        if len(message.psets) == 1:
+            self._last_pset = message.pset
         self.log_box.log(f"Main App: Pset selected: {self.selected_pset}")
+        self.jobs.spawn("params", self._load_params(self.selected_category, self.selected_pset, message.psets))
 
-        # Properly await the async update_params function
-        await self.params_widget.update_params(self.ifc_file, self.selected_category, self.selected_pset)
+    async def _load_params(self, category: str, pset: str, psets: list = None) -> None:
+        key = self._params_key(category, pset, psets)
+        if key == self._prefetch_key and self._prefetch_task is not None and not self._prefetch_task.done():
+            # Already being prepared: wait for it rather than extracting the same table twice
+            await asyncio.wait({self._prefetch_task})
+        else:
+            self.jobs.cancel("prefetch")
+
+        table = self.params_widget.cached_table(key)
+        if table is not None:
+            self.params_widget.show_table(category, pset, table)
+        elif await self._ensure_ifc_file():
+            source = await self._table_source(category, pset, psets)
+            await self.params_widget.update_params(category, pset, source, cache_key=key)
+        else:
+            return
 
         # Update the IfcStatus widget with the selected property set
-        self.query_one(IfcStatus).update_status(ifc_name=self.ifc_filename, category=self.selected_category, pset=self.selected_pset)
+        self.query_one(IfcStatus).update_status(ifc_name=self.ifc_filename, category=category, pset=pset)
+
+    async def _table_source(self, category: str, pset: str, psets: list = None):
+        """Generator function of the requested table chunks, served by the model server or by this process"""
+        from parallel_extraction import iter_parameters_parallel
+
+        across = category == CategoryWidget.ALL_CATEGORIES
+        if self.stream_model is not None:
+            return functools.partial(self.stream_model.iter_parameters, None if across else category, pset, psets)
+        if self.model_server is not None:
+            return functools.partial(self.model_server.iter_parameters, self.ifc_filename,
+                                     None if across else category, pset, psets)
+
+        property_index = await self._ensure_property_index()
+        element_headers = await self._ensure_element_headers()
+        elements = None
+        if across:
+            # The reverse index hands over exactly the elements with the pset, no category is scanned
+            elements = await asyncio.to_thread(property_index.pset_elements, pset)
+
+        return functools.partial(iter_parameters_parallel, self.ifc_file, category, pset, psets,
+                                 property_index=property_index, elements=elements, element_headers=element_headers,
+                                 workers=self.parallel_workers, min_elements=self.parallel_min_elements)
 
     def action_toggle_fullscreen(self) -> None:
         ifcfiles = self.query_one(".IfcFiles")
@@ -244,36 +704,122 @@ class VerticalLayoutExample(App):
             ifcfiles.add_class("hidden")
             ifcProperties.add_class("hidden")
             self.is_fullscreen = True
-        self.log_box.log(f"Fullscreen mode: {'On' if self.is_fullscreen else 'Off'}")
+        self.log_box.debug(f"Fullscreen mode: {'On' if self.is_fullscreen else 'Off'}")
 
     def action_toggle_log(self) -> None:
         self.log_box.display = not self.log_box.display
-        self.log_box.log(f"Log box {'shown' if self.log_box.display else 'hidden'}")
+        self.log_box.debug(f"Log box {'shown' if self.log_box.display else 'hidden'}")
 
-    def action_export_xlsx(self) -> None:
-        self.params_widget.export_to_excel(self.ifc_filename)
+    def action_toggle_timings(self) -> None:
+        self.timings_panel.display = not self.timings_panel.display
+        self.timings_panel.update_view()
+        self.log_box.debug(f"Timings panel {'shown' if self.timings_panel.display else 'hidden'}")
+
+    def action_dump_timings(self) -> None:
+        """Writes the recorded timings to a timestamped JSON file, to compare versions or machines"""
+        timings_dir = self.config_manager.get_timings_dir()
+        file_path = timings_dir / f"timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            timings_dir.mkdir(parents=True, exist_ok=True)
+            self.timings.dump(str(file_path))
+        except OSError as e:
+            self.log_box.log(f"Error saving operation timings: {str(e)}", ERROR)
+            self.status_widget.log(f"[--] Error saving operation timings: {str(e)}")
+            return
+        self.log_box.log(f"Operation timings saved to {file_path}")
+        self.status_widget.log(f"[OK] Operation timings saved to {file_path}")
+
+    def action_export(self, export_format: str = None) -> None:
+        export_format = export_format or self.config_manager.get_export_format()
+        self.jobs.spawn("export", self.params_widget.export_data(self.ifc_filename, export_format))
+
+    def action_export_model(self) -> None:
+        if not self.ifc_filename:
+            self.status_widget.log("[---] Select an IFC file to export")
+            return
+        self.jobs.spawn("export", self._export_model(self.ifc_filename))
+
+    async def _export_model(self, filename: str) -> None:
+        """Exports all categories with all their psets in one pass over the model"""
+        from exporters import export_model_xlsx
+
+        if self._use_streaming(filename):
+            self.status_widget.log("[---] The whole model cannot be exported in low-memory mode, export tables instead")
+            return
+        if not await self._ensure_ifc_file():
+            return
+
+        base_name = os.path.splitext(os.path.basename(filename))[0]
+        file_path = os.path.join(os.path.dirname(filename), f"{base_name}_all.xlsx")
+        per_pset = self.config_manager.get_export_model_sheets() == "pset"
+        start_time = time.perf_counter()
+
+        try:
+            with self.timings.measure("export", os.path.basename(file_path)) as measurement:
+                if self.model_server is not None:
+                    row_count = await self.jobs.run("export", f"Exporting {base_name}",
+                                                    self.model_server.export_model, filename, file_path,
+                                                    per_pset=per_pset)
+                else:
+                    property_index = await self._ensure_property_index()
+                    row_count = await self.jobs.run("export", f"Exporting {base_name}", export_model_xlsx,
+                                                    self.ifc_file, file_path, property_index=property_index,
+                                                    per_pset=per_pset,
+                                                    element_headers=await self._ensure_element_headers())
+                measurement.elements = self.model_summary["products"] if self.model_summary else None
+                measurement.rows = row_count
+            elapsed_time = time.perf_counter() - start_time
+            self.log_box.log(f"Model exported to {file_path} ({row_count} rows in {elapsed_time:.2f} seconds)")
+            self.status_widget.log(f"[+++] Model exported successfully to {file_path}")
+        except JobCancelled:
+            self.log_box.log(f"Export to {file_path} cancelled")
+        except Exception as e:
+            self.log_box.log(f"Error exporting model: {str(e)}", ERROR)
+            self.status_widget.log(f"[--] Error exporting model: {str(e)}")
+
+    def action_toggle_export_modal(self) -> None:
+        from widgets._exportModal import ExportFormatModal
+
+        if isinstance(self.screen, ExportFormatModal):
+            self.pop_screen()
+        else:
+            self.push_screen(ExportFormatModal(), self._on_export_format_selected)
+
+    def _on_export_format_selected(self, export_format) -> None:
+        if export_format:
+            self.action_export(export_format)
+
+    def action_cancel_export(self) -> None:
+        if self.jobs.is_busy("export"):
+            self.jobs.cancel("export")
+            self.status_widget.log("[---] Export cancelled")
 
     def action_focus_file_explorer(self) -> None:
         self.set_focus(self.file_explorer)
-        self.log_box.log("Focused on File Explorer")
+        self.log_box.debug("Focused on File Explorer")
 
     def action_focus_category_widget(self) -> None:
         self.set_focus(self.category_widget)
-        self.log_box.log("Focused on Category Widget")
+        self.log_box.debug("Focused on Category Widget")
 
     def action_focus_pset_widget(self) -> None:
         self.set_focus(self.pset_widget)
-        self.log_box.log("Focused on Pset Widget")
+        self.log_box.debug("Focused on Pset Widget")
 
     def action_focus_params_widget(self) -> None:
         self.set_focus(self.params_widget)
-        self.log_box.log("Focused on Params Widget")
+        self.log_box.debug("Focused on Params Widget")
 
     def action_quit(self) -> None:
         self.log_box.log("Exiting application...")
+        self.jobs.shutdown()
+        if self.model_server is not None:
+            self.model_server.close()
         self.exit()
 
     def action_toggle_theme_modal(self) -> None:
+        from widgets._themeModal import ThemeSelectorModal
+
         if self.is_screen_installed("theme_modal"):
             self.pop_screen()
         else:
@@ -281,10 +827,22 @@ class VerticalLayoutExample(App):
 
 
 if __name__ == "__main__":
+    if "--purge-cache" in sys.argv[1:]:
+        config_manager = ConfigManager("honeycomb")
+        removed = IndexCache(config_manager.get_cache_dir()).purge()
+        print(f"Removed {removed} cached model index(es) from {config_manager.get_cache_dir()}")
+        sys.exit(0)
+
     if len(sys.argv) > 1:
         folder = sys.argv[1]
         if os.path.isdir(folder):
             os.chdir(folder)
 
-    app = VerticalLayoutExample()
+    if startup_profile is not None:
+        startup_profile.mark("imports done")
+    app = VerticalLayoutExample(startup_profile)
+    if startup_profile is not None:
+        startup_profile.mark("app created")
     app.run()
+    if startup_profile is not None:
+        startup_profile.finish()
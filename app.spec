@@ -1,5 +1,9 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# A one-file build unpacks itself into a temporary folder on every launch, which shows up as the time
+# before Python in --startup-profile. HONEY_ONEDIR=1 builds dist/HoneyIFC/ instead, which starts in place.
+ONE_FILE = os.environ.get('HONEY_ONEDIR') != '1'
 
 a = Analysis(
     ['app.py'],
@@ -19,9 +23,9 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
+    *([a.binaries, a.datas] if ONE_FILE else []),
     [],
+    exclude_binaries=not ONE_FILE,
     name='HoneyIFC',
     debug=False,
     bootloader_ignore_signals=False,
@@ -37,3 +41,14 @@ exe = EXE(
     entitlements_file=None,
     icon=['static\\bee.ico'],
 )
+
+if not ONE_FILE:
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        name='HoneyIFC',
+    )
@@ -0,0 +1,210 @@
+"""Headless export of category x pset tables for every IFC model in a folder.
+
+Usage: HoneyIFC.exe --batch FOLDER [--output DIR] [--format csv] [--categories IfcWall,IfcDoor]
+                                   [--psets Pset_WallCommon] [--workers 4] [--force]
+
+Nothing from Textual is imported here, so the command also runs on machines without a terminal UI.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _safe_name(text: str) -> str:
+    return text.replace(" ", "_").replace("/", "_").replace("\\", "_")
+
+
+def _file_signature(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def export_model(path: str, output_dir: str, export_format: str, categories: Optional[List[str]] = None,
+                 psets: Optional[List[str]] = None) -> dict:
+    """Exports all (or the selected) category x pset tables of one model; runs in a worker process"""
+    import ifcopenshell
+
+    from element_headers import ElementHeaders
+    from exporters import export_table, get_exporter
+    from extraction import OptimizedIFCDataProcessor
+    from property_index import PropertyIndex
+
+    exporter = get_exporter(export_format)
+    timings = {"open": 0.0, "index": 0.0, "extract": 0.0, "write": 0.0}
+    started = time.perf_counter()
+
+    ifc_file = ifcopenshell.open(path)
+    timings["open"] = time.perf_counter() - started
+
+    start_time = time.perf_counter()
+    property_index = PropertyIndex.build(ifc_file)
+    timings["index"] = time.perf_counter() - start_time
+
+    model_categories = sorted({element.is_a() for element in ifc_file.by_type("IfcElement")})
+    if categories:
+        model_categories = [category for category in model_categories if category in categories]
+
+    # Every pset table of a category repeats the same element columns, they are read once per model
+    element_headers = ElementHeaders(ifc_file)
+    model_dir = os.path.join(output_dir, _safe_name(os.path.splitext(os.path.basename(path))[0]))
+    os.makedirs(model_dir, exist_ok=True)
+
+    outputs = []
+    rows = 0
+    for category in model_categories:
+        for pset in property_index.pset_names(category):
+            if psets and pset not in psets:
+                continue
+
+            start_time = time.perf_counter()
+            _, table = OptimizedIFCDataProcessor.extract_parameters_optimized(ifc_file, category, pset,
+                                                                              property_index=property_index,
+                                                                              element_headers=element_headers)
+            timings["extract"] += time.perf_counter() - start_time
+            if not len(table):
+                continue
+
+            start_time = time.perf_counter()
+            file_path = os.path.join(model_dir, f"{_safe_name(category)}_{_safe_name(pset)}{exporter.extension}")
+            rows += export_table(table, file_path, exporter.name)
+            timings["write"] += time.perf_counter() - start_time
+            outputs.append(os.path.relpath(file_path, output_dir))
+
+    timings["total"] = time.perf_counter() - started
+    return {"tables": len(outputs), "rows": rows, "outputs": outputs, "timings": timings}
+
+
+class BatchManifest:
+    """Remembers which inputs were exported with which options, so an interrupted run can resume"""
+
+    def __init__(self, output_dir: str):
+        self.file_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries: Dict[str, dict] = {}
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, path: str, options: dict, output_dir: str) -> bool:
+        entry = self.entries.get(os.path.abspath(path))
+        if not entry or entry.get("signature") != _file_signature(path) or entry.get("options") != options:
+            return False
+        return all(os.path.exists(os.path.join(output_dir, output)) for output in entry.get("outputs", []))
+
+    def record(self, path: str, options: dict, result: dict) -> None:
+        self.entries[os.path.abspath(path)] = {
+            "signature": _file_signature(path),
+            "options": options,
+            "outputs": result["outputs"],
+            "timings": result["timings"],
+            "finished": time.time(),
+        }
+        # Saved after every model, so an interrupted run loses at most the models in flight
+        temp_path = f"{self.file_path}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(temp_path, self.file_path)
+
+
+def _print_summary(results: List[tuple]) -> None:
+    if not results:
+        return
+    name_width = max(len("Model"), *(len(os.path.basename(path)) for path, _ in results))
+    header = f"{'Model':<{name_width}}  {'Tables':>6}  {'Rows':>9}  {'Open':>7}  {'Index':>7}  " \
+             f"{'Extract':>7}  {'Write':>7}  {'Total':>7}"
+    print()
+    print(header)
+    print("-" * len(header))
+    for path, result in results:
+        timings = result["timings"]
+        print(f"{os.path.basename(path):<{name_width}}  {result['tables']:>6}  {result['rows']:>9}  "
+              f"{timings['open']:>7.2f}  {timings['index']:>7.2f}  {timings['extract']:>7.2f}  "
+              f"{timings['write']:>7.2f}  {timings['total']:>7.2f}")
+
+
+def run_batch(folder: str, output_dir: Optional[str] = None, export_format: str = "csv",
+              categories: Optional[List[str]] = None, psets: Optional[List[str]] = None,
+              workers: int = 0, force: bool = False) -> int:
+    """Exports every .ifc in folder with a process pool; returns the number of failed models"""
+    from exporters import get_exporter
+
+    get_exporter(export_format)
+    output_dir = os.path.abspath(output_dir or os.path.join(folder, "export"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.lower().endswith(".ifc"))
+    options = {"format": export_format, "categories": sorted(categories or []), "psets": sorted(psets or [])}
+    manifest = BatchManifest(output_dir)
+
+    pending = [path for path in paths if force or not manifest.is_current(path, options, output_dir)]
+    skipped = len(paths) - len(pending)
+    print(f"{len(paths)} model(s) in {folder}, {skipped} unchanged and skipped, exporting {len(pending)} "
+          f"as {export_format} to {output_dir}")
+
+    results = []
+    failed = 0
+    started = time.perf_counter()
+    workers = workers or max(1, min(len(pending), (os.cpu_count() or 2) // 2))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(export_model, path, output_dir, export_format, categories, psets): path
+                       for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"[ERROR] {os.path.basename(path)}: {str(e)}")
+                    continue
+
+                manifest.record(path, options, result)
+                results.append((path, result))
+                print(f"[OK] {os.path.basename(path)}: {result['tables']} table(s), {result['rows']} row(s) "
+                      f"in {result['timings']['total']:.2f} seconds")
+
+    _print_summary(sorted(results))
+    print(f"\nDone in {time.perf_counter() - started:.2f} seconds: {len(results)} exported, {skipped} skipped, "
+          f"{failed} failed")
+    return failed
+
+
+def _split_list(value: Optional[str]) -> Optional[List[str]]:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="HoneyIFC --batch", description="Export IFC parameter tables headlessly")
+    parser.add_argument("folder", help="Folder with .ifc files")
+    parser.add_argument("--output", help="Output folder (default: FOLDER/export)")
+    parser.add_argument("--format", default="csv", help="xlsx, csv, jsonl or npz (default: csv)")
+    parser.add_argument("--categories", help="Comma-separated IFC classes to export (default: all IfcElement classes)")
+    parser.add_argument("--psets", help="Comma-separated property/quantity sets to export (default: all)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: half of the CPUs)")
+    parser.add_argument("--force", action="store_true", help="Export unchanged models again")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error(f"{args.folder} is not a folder")
+
+    try:
+        failed = run_batch(args.folder, args.output, args.format, _split_list(args.categories),
+                           _split_list(args.psets), args.workers, args.force)
+    except ValueError as e:
+        parser.error(str(e))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
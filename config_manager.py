@@ -1,12 +1,15 @@
 import configparser
+import logging
 import os
 from pathlib import Path
+from typing import Optional
 
 
 class ConfigManager:
     def __init__(self, app_name: str = "honeycomb"):
         self.app_name = app_name
         self.config_file = self._get_config_path()
+        self.config_dir = self.config_file.parent
         self.config = configparser.ConfigParser()
         self._load_config()
 
@@ -64,6 +67,123 @@ class ConfigManager:
         self.config.set('THEME', 'current_theme', theme)
         return self._save_config()
 
+    def get_cache_dir(self) -> Path:
+        """Gets the folder of the model index cache, next to the config file"""
+        return self.config_dir / 'cache'
+
+    def get_cache_max_size_mb(self) -> float:
+        """Gets the size limit of the model index cache in MB"""
+        return self.config.getfloat('CACHE', 'max_size_mb', fallback=512.0)
+
+    def get_cache_max_entries(self) -> int:
+        """Gets the maximum number of models kept in the index cache"""
+        return self.config.getint('CACHE', 'max_entries', fallback=64)
+
+    def get_model_budget_mb(self) -> float:
+        """Gets the RSS budget for models kept open in memory in MB (0 - half of the physical memory)"""
+        return self.config.getfloat('CACHE', 'model_budget_mb', fallback=0.0)
+
+    def get_low_memory_mode(self) -> str:
+        """Gets when models are streamed instead of parsed: 'auto' (when they would not fit), 'always' or 'never'"""
+        return self.config.get('CACHE', 'low_memory', fallback='auto').lower()
+
+    def get_job_workers(self) -> int:
+        """Gets how many background jobs may run at the same time"""
+        return self.config.getint('JOBS', 'max_workers', fallback=2)
+
+    def get_log_level(self) -> int:
+        """Gets the verbosity of the log panel (DEBUG, INFO, WARNING or ERROR)"""
+        level = logging.getLevelName(self.config.get('LOG', 'level', fallback='INFO').upper())
+        return level if isinstance(level, int) else logging.INFO
+
+    def get_log_max_lines(self) -> int:
+        """Gets how many lines the log panel keeps"""
+        return self.config.getint('LOG', 'max_lines', fallback=2000)
+
+    def get_log_file(self) -> Optional[Path]:
+        """Gets the rotating log file path, or None if logging to a file is disabled"""
+        if not self.config.getboolean('LOG', 'to_file', fallback=False):
+            return None
+        log_dir = self.config_dir / 'logs'
+        log_dir.mkdir(parents=True, exist_ok=True)
+        return log_dir / 'honeyifc.log'
+
+    def get_model_server_enabled(self) -> bool:
+        """Gets whether models are opened and extracted in a separate worker process"""
+        return self.config.getboolean('SERVER', 'enabled', fallback=False)
+
+    def get_parallel_workers(self) -> int:
+        """Gets how many forked processes extract a big category (0 - one per CPU, 1 - no parallel extraction)"""
+        return self.config.getint('PARALLEL', 'workers', fallback=0)
+
+    def get_parallel_min_elements(self) -> int:
+        """Gets the element count from which a category is extracted in parallel"""
+        return self.config.getint('PARALLEL', 'min_elements', fallback=20000)
+
+    def get_prefetch_enabled(self) -> bool:
+        """Gets whether psets and parameters of the highlighted row are prepared in the background"""
+        return self.config.getboolean('PREFETCH', 'enabled', fallback=True)
+
+    def get_table_cache_size(self) -> int:
+        """Gets how many extracted parameter tables are kept for instant reselection"""
+        return self.config.getint('PREFETCH', 'table_cache', fallback=8)
+
+    def get_browser_recursive(self) -> bool:
+        """Gets whether the file browser also lists the IFC files of subfolders"""
+        return self.config.getboolean('BROWSER', 'recursive', fallback=False)
+
+    def set_browser_recursive(self, recursive: bool) -> bool:
+        """Saves whether the file browser includes subfolders"""
+        if 'BROWSER' not in self.config:
+            self.config.add_section('BROWSER')
+
+        self.config.set('BROWSER', 'recursive', str(recursive).lower())
+        return self._save_config()
+
+    def get_browser_watch(self) -> str:
+        """Gets how the file list follows the folder: auto, inotify, poll or off"""
+        return self.config.get('BROWSER', 'watch', fallback='auto')
+
+    def get_browser_poll_interval(self) -> float:
+        """Gets the seconds between folder listings when the folder is polled"""
+        return self.config.getfloat('BROWSER', 'poll_interval', fallback=2.0)
+
+    def get_browser_header_workers(self) -> int:
+        """Gets how many files the browser reads the STEP header of at the same time"""
+        return self.config.getint('BROWSER', 'header_workers', fallback=8)
+
+    def get_browser_flag_changed_model(self) -> bool:
+        """Gets whether a warning is shown when the opened model changes on disk"""
+        return self.config.getboolean('BROWSER', 'flag_changed_model', fallback=True)
+
+    def get_timings_enabled(self) -> bool:
+        """Gets whether opens, pset fetches, extractions and exports are timed for the timings panel"""
+        return self.config.getboolean('TIMINGS', 'enabled', fallback=True)
+
+    def get_timings_history(self) -> int:
+        """Gets how many of the last operations of each stage the timings panel keeps"""
+        return self.config.getint('TIMINGS', 'history', fallback=200)
+
+    def get_timings_dir(self) -> Path:
+        """Gets the folder of the timings dumps, next to the config file"""
+        return self.config_dir / 'timings'
+
+    def get_export_format(self) -> str:
+        """Gets the format used by the export key (xlsx, csv, jsonl or npz)"""
+        return self.config.get('EXPORT', 'format', fallback='xlsx')
+
+    def set_export_format(self, export_format: str) -> bool:
+        """Saves the selected export format"""
+        if 'EXPORT' not in self.config:
+            self.config.add_section('EXPORT')
+
+        self.config.set('EXPORT', 'format', export_format)
+        return self._save_config()
+
+    def get_export_model_sheets(self) -> str:
+        """Gets the sheet layout of whole-model exports: one sheet per 'category' or per category/'pset'"""
+        return self.config.get('EXPORT', 'model_sheets', fallback='category')
+
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+from typing import Tuple
+
+from extraction import OptimizedExtractParametersHelper, OptimizedIFCDataProcessor
+
+
+class ElementHeaders:
+    """Per-model store of the columns every parameter table repeats: Name, class, PredefinedType and GlobalId.
+
+    Entries are computed on first use and then shared by every params view and export of the model, so
+    switching psets within a category only costs the property lookups. The store can be seeded with the
+    element headers of a model summary, which skips the entity attribute access for those elements entirely.
+    """
+
+    def __init__(self, ifc_file):
+        self.ifc_file = ifc_file
+        self._headers = {}  # element id -> (name, class, PredefinedType, GlobalId)
+        self._seeds = {}  # element id -> (raw Name, class, PredefinedType text, GlobalId) from a summary
+
+    def seed(self, summary_headers: dict) -> None:
+        """Takes {IFC class: [[id, Name, PredefinedType, GlobalId], ...]} as stored by build_model_summary"""
+        for ifc_class, rows in summary_headers.items():
+            for element_id, name, predefined_type, guid in rows:
+                if element_id not in self._headers:
+                    self._seeds[element_id] = (name, ifc_class, predefined_type, guid)
+
+    def get(self, element) -> Tuple:
+        """Same tuple as OptimizedIFCDataProcessor._element_header"""
+        element_id = element.id()
+        header = self._headers.get(element_id)
+        if header is None:
+            seed = self._seeds.pop(element_id, None)
+            if seed is not None:
+                name, ifc_class, predefined_type, guid = seed
+                header = (OptimizedExtractParametersHelper.clean_name(name), ifc_class, predefined_type or None, guid)
+            else:
+                header = OptimizedIFCDataProcessor._element_header(element)
+            self._headers[element_id] = header
+        return header
+
+    def __len__(self) -> int:
+        return len(self._headers)
@@ -0,0 +1,297 @@
+import csv
+import json
+import os
+import warnings
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import Callable, Dict, List, NamedTuple
+
+import numpy as np
+
+from job_manager import CancelToken, JobCancelled
+from property_table import STRING, Column, PropertyTable
+
+# Rows between progress/cancellation checks
+TICK_ROWS = 1000
+
+
+class Exporter(NamedTuple):
+    name: str
+    extension: str
+    description: str
+    write: Callable[..., int]  # write(table, file_path, token=None) -> number of rows
+
+
+EXPORTERS: Dict[str, Exporter] = {}
+
+
+def register_exporter(name: str, extension: str, description: str, write: Callable[..., int]) -> None:
+    """Makes a writer available to export_table, the export format picker and the command line"""
+    EXPORTERS[name] = Exporter(name, extension, description, write)
+
+
+def get_exporter(name: str) -> Exporter:
+    try:
+        return EXPORTERS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{name}', available: {', '.join(EXPORTERS)}")
+
+
+def export_table(table: PropertyTable, file_path: str, export_format: str = None, token: CancelToken = None) -> int:
+    """Writes a table with the exporter named by export_format, or the one matching the file extension"""
+    if export_format is None:
+        export_format = os.path.splitext(file_path)[1].lstrip(".")
+    return get_exporter(export_format).write(table, file_path, token=token)
+
+
+@contextmanager
+def _atomic_path(file_path: str):
+    """Yields a temporary path that replaces file_path only if the block completes"""
+    temp_path = f"{file_path}.part"
+    try:
+        yield temp_path
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def excel_table_range(column_count: int, row_count: int) -> str:
+    """A1 reference of a header row plus data rows, e.g. A1:AB201 (get_column_letter handles columns past Z)"""
+    from openpyxl.utils import get_column_letter
+
+    return f"A1:{get_column_letter(column_count)}{row_count + 1}"
+
+
+def _excel_table(headers: List[str], row_count: int, name: str = "IFCDataTable"):
+    from openpyxl.worksheet.table import Table, TableStyleInfo
+
+    table = Table(displayName=name, ref=excel_table_range(len(headers), row_count))
+    # Write-only sheets cannot read the headings back from the cells, so they are set explicitly
+    table._initialise_columns()
+    for table_column, header in zip(table.tableColumns, headers):
+        table_column.name = str(header)
+    table.tableStyleInfo = TableStyleInfo(
+        name="TableStyleMedium9",
+        showFirstColumn=False,
+        showLastColumn=False,
+        showRowStripes=True,
+        showColumnStripes=False
+    )
+    return table
+
+
+def export_xlsx(table: PropertyTable, file_path: str, token: CancelToken = None,
+                sheet_title: str = "IFC Data Export") -> int:
+    """Streams a PropertyTable into an xlsx file with a write-only workbook and returns the number of rows.
+
+    Rows are decoded chunk by chunk and written straight to the sheet, so the export never holds a
+    second copy of the table. The file is written under a temporary name and only replaces the target
+    once complete, so a cancelled export leaves nothing behind.
+    """
+    # openpyxl takes longer to import than the rest of the exporters, it is loaded with the first workbook
+    from openpyxl import Workbook
+
+    token = token or CancelToken()
+    headers = list(table.column_names)
+    total = len(table)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append(headers)
+
+    try:
+        for index, row_data in enumerate(table.iter_rows()):
+            if index % TICK_ROWS == 0:
+                token.tick(index, total)
+            ws.append(row_data)
+    except JobCancelled:
+        # Finish the temporary sheet file, openpyxl removes it at exit
+        ws.close()
+        raise
+
+    if total:
+        with warnings.catch_warnings():
+            # openpyxl always warns in write-only mode, the columns are already set by _excel_table
+            warnings.simplefilter("ignore", UserWarning)
+            ws.add_table(_excel_table(headers, total))
+
+    with _atomic_path(file_path) as temp_path:
+        wb.save(temp_path)
+    return total
+
+
+def _sheet_title(name: str, used: set) -> str:
+    """Excel sheet names are limited to 31 characters without []:*?/\\ and must be unique (case-insensitive)"""
+    title = "".join("_" if char in '[]:*?/\\' else char for char in name)[:31]
+    candidate, suffix = title, 1
+    while candidate.lower() in used:
+        suffix += 1
+        candidate = f"{title[:31 - len(str(suffix)) - 1]}~{suffix}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def _append_sheet(wb, title: str, headers: List[str], rows, token: CancelToken, table_index: int) -> int:
+    ws = wb.create_sheet(title)
+    ws.append(headers)
+    count = 0
+    for count, row_data in enumerate(rows, start=1):
+        if count % TICK_ROWS == 0:
+            token.check()
+        ws.append(row_data)
+
+    if count:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            ws.add_table(_excel_table(headers, count, name=f"IFCDataTable{table_index}"))
+    return count
+
+
+def export_model_xlsx(ifc_file, file_path: str, property_index=None, token: CancelToken = None,
+                      per_pset: bool = False, element_headers=None) -> int:
+    """Exports every IfcElement category of a model into one workbook and returns the number of rows written.
+
+    The model is walked once: elements are grouped by class, and the psets of each element are fetched
+    with a single get_psets call. By default there is one sheet per category with Pset.Property columns;
+    with per_pset every category/pset pair gets its own sheet, laid out like a single table export.
+    """
+    from openpyxl import Workbook
+
+    from extraction import OptimizedIFCDataProcessor
+
+    token = token or CancelToken()
+    groups = {}
+    for element in ifc_file.by_type("IfcElement"):
+        groups.setdefault(element.is_a(), []).append(element)
+
+    wb = Workbook(write_only=True)
+    used_titles = set()
+    written = 0
+
+    try:
+        for category in sorted(groups):
+            chunks = OptimizedIFCDataProcessor.iter_psets_chunks(
+                ifc_file, category, token=token, property_index=property_index, elements=groups[category],
+                element_headers=element_headers)
+
+            if not per_pset:
+                # Streamed straight into the sheet, the header comes with the first chunk
+                first = next(chunks, None)
+                if first is None:
+                    continue
+                headers = first[2].column_names
+                sheet_rows = (row for _, _, chunk in chain([first], chunks) for row in chunk.iter_rows())
+                written += _append_sheet(wb, _sheet_title(category, used_titles), headers, sheet_rows, token,
+                                         len(used_titles))
+                continue
+
+            # Every pset sheet reads the same rows, so the category table is kept until its sheets are written
+            table = PropertyTable()
+            param_keys = []
+            for param_keys, _, chunk in chunks:
+                table.extend(chunk)
+            if not len(table):
+                continue
+
+            # Element columns are No, IfcCategory, PredefinedType, IfcElementName, then the psets, then GUID
+            element_count = len(OptimizedIFCDataProcessor.ELEMENT_COLUMNS) - 1
+            pset_columns = {}
+            # From the (pset, property) pairs: pset names may contain the separator
+            for offset, (pset, param) in enumerate(param_keys, start=element_count):
+                pset_columns.setdefault(pset, []).append((offset, param))
+
+            for pset, columns in pset_columns.items():
+                headers = OptimizedIFCDataProcessor.column_names([param for _, param in columns])
+                sheet_rows = (list(row[:element_count]) + [pset] + [row[offset] for offset, _ in columns] + [row[-1]]
+                              for row in table.iter_rows())
+                written += _append_sheet(wb, _sheet_title(f"{category}.{pset}", used_titles), headers,
+                                         sheet_rows, token, len(used_titles))
+    except JobCancelled:
+        for ws in wb.worksheets:
+            if not ws.closed:
+                ws.close()
+        raise
+
+    if not wb.worksheets:
+        wb.create_sheet("No elements")
+
+    with _atomic_path(file_path) as temp_path:
+        wb.save(temp_path)
+    return written
+
+
+def export_csv(table: PropertyTable, file_path: str, token: CancelToken = None) -> int:
+    """Streams a table into a UTF-8 CSV file (with BOM, so Excel detects the encoding); nulls are empty fields"""
+    token = token or CancelToken()
+    total = len(table)
+    rows = table.iter_rows()
+
+    with _atomic_path(file_path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(table.column_names)
+            for start in range(0, total, TICK_ROWS):
+                token.tick(start, total)
+                writer.writerows(islice(rows, TICK_ROWS))
+    return total
+
+
+def export_jsonl(table: PropertyTable, file_path: str, token: CancelToken = None) -> int:
+    """Streams a table as JSON Lines, one object per row keyed by column name; nulls are null"""
+    token = token or CancelToken()
+    total = len(table)
+    names = table.column_names
+    rows = table.iter_rows()
+
+    with _atomic_path(file_path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+            for start in range(0, total, TICK_ROWS):
+                token.tick(start, total)
+                f.writelines(json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+                             for row in islice(rows, TICK_ROWS))
+    return total
+
+
+def export_npz(table: PropertyTable, file_path: str, token: CancelToken = None) -> int:
+    """Dumps the typed columns as-is into a compressed NumPy archive, see load_npz.
+
+    Per column i: values_i, nulls_i and, for dictionary-encoded strings, categories_i.
+    """
+    token = token or CancelToken()
+    names = table.column_names
+    arrays = {"columns": np.array(names, dtype=str)}
+    kinds = []
+
+    for index in range(len(names)):
+        token.tick(index, len(names))
+        column = table.column(index)
+        kinds.append(column.kind)
+        arrays[f"values_{index}"] = column.values
+        arrays[f"nulls_{index}"] = column.nulls
+        if column.kind == STRING:
+            arrays[f"categories_{index}"] = np.array(column.categories, dtype=str)
+    arrays["kinds"] = np.array(kinds, dtype=str)
+
+    with _atomic_path(file_path) as temp_path:
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+    return len(table)
+
+
+def load_npz(file_path: str) -> PropertyTable:
+    """Reads a table written by export_npz back into a PropertyTable"""
+    with np.load(file_path) as archive:
+        names = archive["columns"].tolist()
+        kinds = archive["kinds"].tolist()
+        columns = []
+        for index, kind in enumerate(kinds):
+            categories = archive[f"categories_{index}"].tolist() if kind == STRING else None
+            columns.append(Column(kind, archive[f"values_{index}"], archive[f"nulls_{index}"], categories))
+    return PropertyTable.from_columns(names, columns)
+
+
+register_exporter("xlsx", ".xlsx", "Excel workbook with a formatted table", export_xlsx)
+register_exporter("csv", ".csv", "Comma-separated values, UTF-8", export_csv)
+register_exporter("jsonl", ".jsonl", "JSON Lines, one object per element", export_jsonl)
+register_exporter("npz", ".npz", "Typed columnar NumPy archive", export_npz)
@@ -0,0 +1,285 @@
+import re
+from typing import List, Tuple, Optional, Dict, Iterator
+
+import ifcopenshell
+import ifcopenshell.util.element
+
+from job_manager import CancelToken, JobCancelled
+from property_table import PropertyTable
+
+
+class OptimizedExtractParametersHelper:
+    """Optimized helper for parameter extraction"""
+
+    @staticmethod
+    def _get_element_pset_fast(element, pset_name):
+        """Fast property set extraction with minimal fallback"""
+        try:
+            pset_data = ifcopenshell.util.element.get_pset(element, pset_name)
+            if pset_data:
+                return pset_data
+        except:
+            pass
+
+        try:
+            all_psets = ifcopenshell.util.element.get_psets(element)
+            return all_psets.get(pset_name, {})
+        except:
+            return {}
+
+    @staticmethod
+    def clean_name(value, default_value="Unnamed"):
+        """Element name without the trailing id that some exporters append"""
+        if value is None:
+            return default_value
+        # Убираем ID в конце строки (например: ":1234567" или "#1234567")
+        cleaned_value = re.sub(r'[:#]\d+$', '', str(value)).strip()
+        return cleaned_value if cleaned_value else default_value
+
+    @staticmethod
+    def _safe_get_attribute(element, attribute_name, default_value="Empty"):
+        try:
+            value = getattr(element, attribute_name, None)
+            if value is not None:
+                # Специальная обработка для имени элемента
+                if attribute_name == 'Name':
+                    return OptimizedExtractParametersHelper.clean_name(value, default_value)
+                return value
+            return default_value
+        except:
+            return default_value
+
+
+class OptimizedIFCDataProcessor:
+    """Optimized IFC data processor"""
+
+    # The first chunk is small so the first screenful shows up at once, later ones are bigger to keep overhead low
+    FIRST_CHUNK_SIZE = 100
+    CHUNK_SIZE = 2000
+
+    ELEMENT_COLUMNS = ["No", "IfcCategory", "PredefinedType", "IfcElementName", "PsetName"]
+
+    # Columns of several psets side by side are namespaced, e.g. Pset_WallCommon.FireRating
+    PSET_SEPARATOR = "."
+
+    @staticmethod
+    def column_names(param_names: List[str]) -> List[str]:
+        return OptimizedIFCDataProcessor.ELEMENT_COLUMNS + list(param_names) + ["GUID"]
+
+    @staticmethod
+    def multi_pset_column_names(param_names: List[str]) -> List[str]:
+        return OptimizedIFCDataProcessor.ELEMENT_COLUMNS[:-1] + list(param_names) + ["GUID"]
+
+    @staticmethod
+    def multi_pset_keys(names: Dict[str, set]) -> Tuple[List[Tuple], List[str]]:
+        """(pset, property) pairs in column order and their Pset.Property column names"""
+        param_keys = [(pset, param) for pset in sorted(names) for param in sorted(names[pset])]
+        param_names = [f"{pset}{OptimizedIFCDataProcessor.PSET_SEPARATOR}{param}" for pset, param in param_keys]
+        return param_keys, param_names
+
+    @staticmethod
+    def _element_header(element) -> Tuple:
+        """Name, class, PredefinedType and GlobalId of an element"""
+        element_name = OptimizedExtractParametersHelper._safe_get_attribute(element, 'Name', "Unnamed")
+        ifc_category = element.is_a()
+        predefined_type = OptimizedExtractParametersHelper._safe_get_attribute(element, 'PredefinedType', None)
+        element_guid = OptimizedExtractParametersHelper._safe_get_attribute(element, 'GlobalId', None)
+        return element_name, ifc_category, predefined_type, element_guid
+
+    @staticmethod
+    def _header(element, element_headers=None) -> Tuple:
+        if element_headers is not None:
+            return element_headers.get(element)
+        return OptimizedIFCDataProcessor._element_header(element)
+
+    @staticmethod
+    def _build_row(index: int, element, pset: str, pset_data: Optional[Dict], param_names: List[str],
+                   element_headers=None) -> List:
+        """Row of raw values, None where a value is missing; formatting is left to the consumer"""
+        try:
+            element_name, ifc_category, predefined_type, element_guid = \
+                OptimizedIFCDataProcessor._header(element, element_headers)
+
+            row_data = [index, ifc_category, predefined_type, element_name, pset]
+
+            if pset_data:
+                row_data.extend(pset_data.get(param) for param in param_names)
+            else:
+                row_data.extend([None] * len(param_names))
+
+            row_data.append(element_guid)
+            return row_data
+
+        except Exception as row_error:
+            return [index, "ERROR", "ERROR", f"Error: {str(row_error)}", pset] + ["ERROR"] * len(param_names) + [
+                "ERROR"]
+
+    @staticmethod
+    def iter_parameters(ifc_file, category: str, pset: str, token: CancelToken = None, property_index=None,
+                        chunk_size: int = None, elements: Optional[list] = None, element_headers=None
+                        ) -> Iterator[Tuple[List[str], PropertyTable]]:
+        """Yields (param_names, table) chunks of the parameter table as typed columnar PropertyTables.
+
+        The psets are collected first since they define the columns, rows are then built and
+        yielded chunk by chunk. With a PropertyIndex the pset of each element is a dictionary lookup
+        instead of an inverse traversal. Passing elements (e.g. PropertyIndex.pset_elements) replaces
+        the by_type(category) lookup, so one pset can be extracted across classes. An ElementHeaders store
+        shares the Name/class/PredefinedType/GlobalId columns between tables of the same model.
+        """
+        token = token or CancelToken()
+        chunk_size = chunk_size or OptimizedIFCDataProcessor.CHUNK_SIZE
+        try:
+            if elements is None:
+                elements = ifc_file.by_type(category)
+            if not elements:
+                return
+
+            if property_index is not None:
+                # The columns come from the pset definitions alone, values are resolved while rows are streamed
+                element_ids = [element.id() for element in elements]
+                token.total = len(elements)
+                param_names = sorted(property_index.property_names(element_ids, pset, token))
+                elements_data = ((element, None) for element in elements)
+            else:
+                # Single pass to collect all parameters and cache element data
+                all_params = set()
+                elements_data = []
+
+                for index, element in enumerate(elements):
+                    token.tick(index, len(elements))
+                    pset_data = OptimizedExtractParametersHelper._get_element_pset_fast(element, pset)
+                    if pset_data:
+                        all_params.update(pset_data.keys())
+
+                    elements_data.append((element, pset_data))
+
+                param_names = sorted(list(all_params))
+
+            columns = OptimizedIFCDataProcessor.column_names(param_names)
+            rows = []
+            limit = min(OptimizedIFCDataProcessor.FIRST_CHUNK_SIZE, chunk_size)
+            for index, (element, pset_data) in enumerate(elements_data, start=1):
+                if property_index is not None:
+                    pset_data = property_index.get_pset(element.id(), pset)
+                rows.append(OptimizedIFCDataProcessor._build_row(index, element, pset, pset_data, param_names,
+                                                                 element_headers))
+                if len(rows) >= limit:
+                    token.tick(index)
+                    yield param_names, PropertyTable.from_rows(columns, rows)
+                    rows = []
+                    limit = chunk_size
+
+            if rows:
+                yield param_names, PropertyTable.from_rows(columns, rows)
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error extracting parameters: {str(e)}")
+
+    @staticmethod
+    def _build_multi_pset_row(index: int, element, psets_data: Optional[Dict], param_keys: List[Tuple],
+                              element_headers=None) -> List:
+        try:
+            element_name, ifc_category, predefined_type, element_guid = \
+                OptimizedIFCDataProcessor._header(element, element_headers)
+
+            row_data = [index, ifc_category, predefined_type, element_name]
+            psets_data = psets_data or {}
+            row_data.extend(psets_data.get(pset, {}).get(param) for pset, param in param_keys)
+            row_data.append(element_guid)
+            return row_data
+
+        except Exception as row_error:
+            return [index, "ERROR", "ERROR", f"Error: {str(row_error)}"] + ["ERROR"] * len(param_keys) + ["ERROR"]
+
+    @staticmethod
+    def iter_psets_parameters(ifc_file, category: str, psets: Optional[List[str]] = None, token: CancelToken = None,
+                              property_index=None, chunk_size: int = None, elements: Optional[list] = None,
+                              element_headers=None) -> Iterator[Tuple[List[str], PropertyTable]]:
+        """Like iter_parameters, but with several psets (all of them if psets is None) side by side.
+
+        Columns are named Pset.Property. The psets of each element come from a single get_psets
+        call, so adding sets to the table does not add traversals of the model.
+        """
+        for _, param_names, chunk in OptimizedIFCDataProcessor.iter_psets_chunks(
+                ifc_file, category, psets, token, property_index, chunk_size, elements, element_headers):
+            yield param_names, chunk
+
+    @staticmethod
+    def iter_psets_chunks(ifc_file, category: str, psets: Optional[List[str]] = None, token: CancelToken = None,
+                          property_index=None, chunk_size: int = None, elements: Optional[list] = None,
+                          element_headers=None) -> Iterator[Tuple[List[Tuple], List[str], PropertyTable]]:
+        """iter_psets_parameters chunks with the (pset, property) pair of every column.
+
+        Pset names may contain the separator themselves, so the pairs are the only reliable way back
+        from a Pset.Property column to its pset.
+        """
+        token = token or CancelToken()
+        chunk_size = chunk_size or OptimizedIFCDataProcessor.CHUNK_SIZE
+        wanted = set(psets) if psets else None
+        try:
+            if elements is None:
+                elements = ifc_file.by_type(category)
+            if not elements:
+                return
+
+            if property_index is not None:
+                token.total = len(elements)
+                names = property_index.pset_property_names([element.id() for element in elements], wanted, token)
+                elements_data = ((element, None) for element in elements)
+            else:
+                names = {}
+                elements_data = []
+                for index, element in enumerate(elements):
+                    token.tick(index, len(elements))
+                    psets_data = ifcopenshell.util.element.get_psets(element)
+                    for pset, pset_data in psets_data.items():
+                        if wanted is None or pset in wanted:
+                            names.setdefault(pset, set()).update(pset_data.keys())
+                    elements_data.append((element, psets_data))
+
+            param_keys, param_names = OptimizedIFCDataProcessor.multi_pset_keys(names)
+            columns = OptimizedIFCDataProcessor.multi_pset_column_names(param_names)
+
+            rows = []
+            limit = min(OptimizedIFCDataProcessor.FIRST_CHUNK_SIZE, chunk_size)
+            for index, (element, psets_data) in enumerate(elements_data, start=1):
+                if property_index is not None:
+                    psets_data = property_index.get_psets(element.id())
+                rows.append(OptimizedIFCDataProcessor._build_multi_pset_row(index, element, psets_data, param_keys,
+                                                                            element_headers))
+                if len(rows) >= limit:
+                    token.tick(index)
+                    yield param_keys, param_names, PropertyTable.from_rows(columns, rows)
+                    rows = []
+                    limit = chunk_size
+
+            if rows:
+                yield param_keys, param_names, PropertyTable.from_rows(columns, rows)
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error extracting parameters: {str(e)}")
+
+    @staticmethod
+    def collect_table(source, token: CancelToken = None) -> PropertyTable:
+        """Runs a chunk generator function (a partial of iter_parameters and the like) to the end as one table"""
+        table = PropertyTable()
+        for _, chunk in source(token=token):
+            table.extend(chunk)
+        table.consolidate()
+        return table
+
+    @staticmethod
+    def extract_parameters_optimized(ifc_file, category: str, pset: str, token: CancelToken = None,
+                                     property_index=None, element_headers=None) -> Tuple[List[str], PropertyTable]:
+        """Extract parameters with caching for better performance"""
+        param_names, table = [], PropertyTable()
+        for param_names, chunk in OptimizedIFCDataProcessor.iter_parameters(ifc_file, category, pset, token,
+                                                                            property_index,
+                                                                            element_headers=element_headers):
+            table.extend(chunk)
+        table.consolidate()
+        return param_names, table
@@ -0,0 +1,251 @@
+"""Background listing of the IFC files of a folder, for the file browser.
+
+The folder is read with os.scandir, whose entries carry their file type (and on Windows their stat
+result) from the directory listing itself, so a file costs at most one stat call instead of the
+isfile/getsize pair. Files are yielded in batches as they are found, so a folder on a slow network
+share fills the browser while it is still being read. The listing of every directory is kept with the
+modification time of the directory; a directory that has not changed since is not read again.
+
+HeaderSummaries adds what the STEP HEADER and a bounded prefix of a file tell (see scan_summary) for the
+browser columns, read by a thread pool and kept on disk per file size and mtime.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from job_manager import CancelToken
+from step_scanner import scan_summary
+
+# Files per batch handed to the browser
+BATCH_SIZE = 200
+IFC_EXTENSIONS = (".ifc",)
+
+# Reading a header is mostly waiting for the disk or the network share, so more threads than CPUs pay off
+HEADER_WORKERS = 8
+HEADER_CACHE_NAME = "headers.json"
+HEADER_CACHE_VERSION = 1
+HEADER_CACHE_ENTRIES = 10000
+# Summaries are handed over at least this often while the pool is busy
+SUMMARY_INTERVAL = 0.2
+
+
+class FileEntry(NamedTuple):
+    path: str  # relative to the scanned folder, also the row key of the browser
+    size: int
+    mtime_ns: int
+
+
+class FolderScanner:
+    """Lists files by extension, optionally including subfolders; shared listings are thread-safe"""
+
+    def __init__(self, extensions: Tuple[str, ...] = IFC_EXTENSIONS):
+        self.extensions = tuple(extension.lower() for extension in extensions)
+        # Absolute directory -> (directory mtime_ns, files, subdirectory names)
+        self._listings: Dict[str, Tuple[int, List[FileEntry], List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _read_directory(self, directory: str, relative: str, subdirs: List[str], token: CancelToken,
+                        refresh: bool = False) -> Iterator[FileEntry]:
+        """Yields the matching files of one directory as scandir returns them and caches the complete listing.
+
+        With refresh the directory is read even if unchanged, files rewritten in place keep its mtime.
+        """
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with self._lock:
+            cached = None if refresh else self._listings.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            subdirs.extend(cached[2])
+            yield from cached[1]
+            return
+
+        files = []
+        names = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                token.check()
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Hidden folders (.git, .cache...) hold no models worth listing
+                        if not entry.name.startswith("."):
+                            names.append(entry.name)
+                        continue
+                    if not entry.name.lower().endswith(self.extensions) or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # Removed meanwhile or not readable, the rest of the folder still counts
+                    continue
+                file_entry = FileEntry(os.path.join(relative, entry.name) if relative else entry.name,
+                                       stat.st_size, stat.st_mtime_ns)
+                files.append(file_entry)
+                yield file_entry
+
+        with self._lock:
+            self._listings[directory] = (mtime_ns, files, names)
+        subdirs.extend(names)
+
+    def scan(self, folder: str = ".", recursive: bool = False, batch_size: int = BATCH_SIZE,
+             token: CancelToken = None) -> Iterator[List[FileEntry]]:
+        """Yields batches of matching files, the folder itself first, then its subfolders breadth first"""
+        token = token or CancelToken()
+        root = os.path.abspath(folder)
+        pending = deque([""])
+        found = 0
+        batch = []
+
+        while pending:
+            relative = pending.popleft()
+            directory = os.path.join(root, relative) if relative else root
+            subdirs = []
+            try:
+                for file_entry in self._read_directory(directory, relative, subdirs, token):
+                    batch.append(file_entry)
+                    if len(batch) >= batch_size:
+                        found += len(batch)
+                        token.tick(found)
+                        yield batch
+                        batch = []
+            except OSError:
+                # An unreadable subfolder does not end the scan
+                if not relative:
+                    raise
+            if batch:
+                # What a folder holds is shown before the next one is read, however few files it has
+                found += len(batch)
+                token.tick(found)
+                yield batch
+                batch = []
+            if recursive:
+                pending.extend(os.path.join(relative, name) if relative else name for name in sorted(subdirs))
+
+    def read_directory(self, folder: str, relative: str = "", refresh: bool = False) -> Tuple[List[FileEntry], List[str]]:
+        """Complete listing of one directory below folder: its matching files and its subfolder names"""
+        root = os.path.abspath(folder)
+        directory = os.path.join(root, relative) if relative else root
+        subdirs = []
+        files = list(self._read_directory(directory, relative, subdirs, CancelToken(), refresh))
+        return files, subdirs
+
+    def forget(self, folder: str = ".") -> None:
+        """Drops the cached listings of a folder and of everything below it"""
+        root = os.path.abspath(folder)
+        with self._lock:
+            for directory in [directory for directory in self._listings
+                              if directory == root or directory.startswith(root + os.sep)]:
+                del self._listings[directory]
+
+
+class HeaderSummaries:
+    """scan_summary results of listed files, valid as long as a file keeps its size and mtime"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, workers: int = HEADER_WORKERS):
+        self.file_path = Path(cache_dir) / HEADER_CACHE_NAME if cache_dir else None
+        self.workers = workers
+        self._lock = threading.Lock()
+        # Absolute path -> {"size", "mtime", "used", "summary"}, loaded by the first lookup, off the UI thread
+        self._entries: Optional[Dict[str, dict]] = None
+        self._changed = False
+
+    @staticmethod
+    def _key(folder: str, path: str) -> str:
+        return os.path.normcase(os.path.abspath(os.path.join(folder, path)))
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if self.file_path is None:
+            return self._entries
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._entries
+        if isinstance(data, dict) and data.get("version") == HEADER_CACHE_VERSION:
+            self._entries = data.get("entries", {})
+        return self._entries
+
+    def save(self) -> None:
+        """Writes the cache if anything was added, least recently listed files beyond the limit are dropped"""
+        with self._lock:
+            if self.file_path is None or not self._changed:
+                return
+            if len(self._entries) > HEADER_CACHE_ENTRIES:
+                kept = sorted(self._entries.items(), key=lambda item: item[1]["used"])[-HEADER_CACHE_ENTRIES:]
+                self._entries = dict(kept)
+            # Serialized under the lock, the pool may still be adding entries
+            text = json.dumps({"version": HEADER_CACHE_VERSION, "entries": self._entries}, separators=(",", ":"))
+            self._changed = False
+
+        tmp_file = self.file_path.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_file, self.file_path)
+        except OSError as e:
+            print(f"Error saving header cache: {e}")
+
+    def get(self, file_entry: FileEntry, folder: str = ".") -> Optional[dict]:
+        """The cached summary of a listed file, None if it is unknown or has changed since"""
+        with self._lock:
+            entry = self._load().get(self._key(folder, file_entry.path))
+            if entry is None or entry["size"] != file_entry.size or entry["mtime"] != file_entry.mtime_ns:
+                return None
+            entry["used"] = time.time()
+            return entry["summary"]
+
+    def _put(self, file_entry: FileEntry, folder: str, summary: dict) -> None:
+        with self._lock:
+            self._load()[self._key(folder, file_entry.path)] = {
+                "size": file_entry.size, "mtime": file_entry.mtime_ns, "used": time.time(), "summary": summary}
+            self._changed = True
+
+    def compute(self, file_entries: List[FileEntry], folder: str = ".",
+                token: CancelToken = None) -> Iterator[List[Tuple[str, Optional[dict]]]]:
+        """Yields (path, summary) batches: the cached summaries at once, then the others as the pool reads them.
+
+        Unreadable files get None and are tried again next time. What was read is cached also on cancellation.
+        """
+        token = token or CancelToken()
+        cached = []
+        missing = []
+        for file_entry in file_entries:
+            summary = self.get(file_entry, folder)
+            if summary is None:
+                missing.append(file_entry)
+            else:
+                cached.append((file_entry.path, summary))
+        if cached:
+            yield cached
+        if not missing:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="honey-header")
+        try:
+            futures = {executor.submit(scan_summary, os.path.join(folder, file_entry.path)): file_entry
+                       for file_entry in missing}
+            batch = []
+            handed = time.perf_counter()
+            for done, future in enumerate(as_completed(futures), start=1):
+                token.tick(done, len(futures))
+                file_entry = futures[future]
+                try:
+                    summary = future.result()
+                    self._put(file_entry, folder, summary)
+                except (OSError, ValueError):
+                    summary = None
+                batch.append((file_entry.path, summary))
+                if time.perf_counter() - handed >= SUMMARY_INTERVAL:
+                    yield batch
+                    batch = []
+                    handed = time.perf_counter()
+            if batch:
+                yield batch
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.save()
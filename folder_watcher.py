@@ -0,0 +1,247 @@
+"""Keeps the file browser in step with its folder: files added, removed or rewritten while the app runs.
+
+A watcher thread compares fresh directory listings with the files it knows and reports the difference.
+On Linux the directories are watched with inotify and only a directory with events is listed again;
+elsewhere, or where inotify is not available, every known directory is listed again every few seconds.
+Network shares only deliver inotify events for changes made by this machine, use polling for them.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+
+from folder_scanner import FileEntry, FolderScanner
+
+POLL_INTERVAL = 2.0
+# Events are collected until the folder has been quiet this long (a copy writes many times), at most MAX_DELAY
+SETTLE_TIME = 0.5
+MAX_DELAY = 2.0
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+              | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class FolderChanges(NamedTuple):
+    added: List[FileEntry]
+    removed: List[str]
+    changed: List[FileEntry]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def wait(self, timeout: float) -> bool:
+        return bool(select.select([self.fd], [], [], timeout)[0])
+
+    def read_events(self) -> List[tuple]:
+        """(wd, mask, name) of every queued event"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def inotify_available() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        _Inotify().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+class FolderWatcher:
+    """Reports FolderChanges of the files a FolderScanner lists to on_changes, from its own thread.
+
+    mode is "auto" (inotify where available, otherwise polling), "inotify" or "poll". The files shown when
+    the watcher starts are the baseline, so changes made while the folder was being scanned are not lost.
+    """
+
+    def __init__(self, scanner: FolderScanner, on_changes: Callable[[FolderChanges], None], folder: str = ".",
+                 recursive: bool = False, mode: str = "auto", poll_interval: float = POLL_INTERVAL):
+        self.scanner = scanner
+        self.on_changes = on_changes
+        self.folder = os.path.abspath(folder)
+        self.recursive = recursive
+        self.mode = "inotify" if mode in ("auto", "inotify") and inotify_available() else "poll"
+        self.poll_interval = poll_interval
+        # Relative directory -> its files by path, and -> its watched subfolders (recursive only)
+        self._files: Dict[str, Dict[str, FileEntry]] = {}
+        self._subdirs: Dict[str, Set[str]] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, files: List[FileEntry]) -> None:
+        for file_entry in files:
+            self._files.setdefault(os.path.dirname(file_entry.path), {})[file_entry.path] = file_entry
+        self._thread = threading.Thread(target=self._run, name="honey-folder-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        try:
+            if self.mode == "inotify":
+                try:
+                    self._inotify = _Inotify()
+                except OSError:
+                    self.mode = "poll"
+            changes = FolderChanges([], [], [])
+            shown = set(self._files)
+            self._add_directory("", changes)
+            # Subfolders removed while the folder was being scanned are no longer found from the top
+            listed = {""}.union(*self._subdirs.values())
+            for relative in shown - listed:
+                self._drop_directory(relative, changes)
+            self._report(changes)
+
+            if self._inotify is not None:
+                self._watch_events()
+            else:
+                self._poll()
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+
+    def _report(self, changes: FolderChanges) -> None:
+        if not changes.is_empty() and not self._stop.is_set():
+            self.on_changes(changes)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            changes = FolderChanges([], [], [])
+            for relative in list(self._files):
+                # Dropped meanwhile with its parent folder
+                if relative in self._files:
+                    self._refresh_directory(relative, changes)
+            self._report(changes)
+
+    def _watch_events(self) -> None:
+        inotify = self._inotify
+        while not self._stop.is_set():
+            if not inotify.wait(0.5):
+                continue
+            dirty = set()
+            waited = 0.0
+            while True:
+                for wd, mask, name in inotify.read_events():
+                    if mask & IN_Q_OVERFLOW:
+                        dirty.update(self._files)
+                    elif mask & IN_IGNORED:
+                        # The folder is gone, its parent reports the deletion
+                        self._watches.pop(wd, None)
+                    elif wd in self._watches and (mask & IN_ISDIR or name.lower().endswith(self.scanner.extensions)):
+                        dirty.add(self._watches[wd])
+                if waited >= MAX_DELAY or not inotify.wait(SETTLE_TIME):
+                    break
+                waited += SETTLE_TIME
+
+            changes = FolderChanges([], [], [])
+            for relative in sorted(dirty):
+                if relative in self._files:
+                    self._refresh_directory(relative, changes)
+            self._report(changes)
+
+    def _add_directory(self, relative: str, changes: FolderChanges) -> None:
+        if self._inotify is not None:
+            try:
+                self._watches[self._inotify.add_watch(os.path.join(self.folder, relative))] = relative
+            except OSError:
+                # Out of watches (fs.inotify.max_user_watches) or unreadable; the folder is still listed
+                pass
+        self._files.setdefault(relative, {})
+        self._refresh_directory(relative, changes)
+
+    def _drop_directory(self, relative: str, changes: FolderChanges) -> None:
+        changes.removed.extend(self._files.pop(relative, {}))
+        for subdir in self._subdirs.pop(relative, ()):
+            self._drop_directory(subdir, changes)
+        for wd in [wd for wd, watched in self._watches.items() if watched == relative]:
+            del self._watches[wd]
+            self._inotify.remove_watch(wd)
+
+    def _refresh_directory(self, relative: str, changes: FolderChanges) -> None:
+        """Lists one directory again and records how its files differ from the known ones"""
+        try:
+            files, names = self.scanner.read_directory(self.folder, relative, refresh=True)
+        except OSError:
+            if relative:
+                self._drop_directory(relative, changes)
+            return
+
+        known = self._files.get(relative, {})
+        current = {file_entry.path: file_entry for file_entry in files}
+        for path, file_entry in current.items():
+            previous = known.get(path)
+            if previous is None:
+                changes.added.append(file_entry)
+            elif (previous.size, previous.mtime_ns) != (file_entry.size, file_entry.mtime_ns):
+                changes.changed.append(file_entry)
+        changes.removed.extend(path for path in known if path not in current)
+        self._files[relative] = current
+
+        if not self.recursive:
+            return
+        subdirs = {os.path.join(relative, name) if relative else name for name in names}
+        watched = self._subdirs.get(relative, set())
+        self._subdirs[relative] = subdirs
+        for subdir in sorted(watched - subdirs):
+            self._drop_directory(subdir, changes)
+        for subdir in sorted(subdirs - watched):
+            self._add_directory(subdir, changes)
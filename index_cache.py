@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+CACHE_FORMAT_VERSION = 4
+HASH_SAMPLE_SIZE = 1024 * 1024  # Bytes hashed from the head and from the tail of a file
+
+
+def build_model_summary(ifc_file, property_index, token=None) -> dict:
+    """Collects everything the category and pset panes need from an opened model"""
+    categories = {}
+    headers = {}
+    elements = ifc_file.by_type("IfcElement")
+    for index, element in enumerate(elements):
+        if token:
+            token.tick(index, len(elements))
+        entity_type = element.is_a()
+        categories[entity_type] = categories.get(entity_type, 0) + 1
+        headers.setdefault(entity_type, []).append([
+            element.id(),
+            getattr(element, "Name", None),
+            str(getattr(element, "PredefinedType", None) or ""),
+            getattr(element, "GlobalId", None),
+        ])
+
+    return {
+        "schema": ifc_file.schema,
+        "products": len(ifc_file.by_type("IfcProduct")),
+        "categories": categories,
+        "psets": {category: property_index.pset_names(category) for category in categories},
+        "pset_counts": property_index.pset_counts(),
+        "headers": headers,
+    }
+
+
+class IndexCache:
+    """Persistent on-disk cache of model summaries, one gzipped JSON file per IFC file"""
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 512, max_entries: int = 64):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_entries = max_entries
+        self.manifest_file = self.cache_dir / "manifest.json"
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._manifest = self._load_manifest()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        """Cache key of a file: hash of its normalized absolute path"""
+        normalized = os.path.normcase(os.path.abspath(path))
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def content_hash(path: str, size: int) -> str:
+        """Hashes the head and the tail of the file (STEP headers carry the save timestamp)"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(size).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read(HASH_SAMPLE_SIZE))
+            if size > 2 * HASH_SAMPLE_SIZE:
+                f.seek(-HASH_SAMPLE_SIZE, os.SEEK_END)
+                digest.update(f.read(HASH_SAMPLE_SIZE))
+        return digest.hexdigest()
+
+    def _entry_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def _load_manifest(self) -> dict:
+        """Loads the LRU bookkeeping, dropping entries whose data file is gone"""
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != CACHE_FORMAT_VERSION:
+            return {}
+        entries = manifest.get("entries", {})
+        return {key: entry for key, entry in entries.items() if self._entry_file(key).exists()}
+
+    def _save_manifest(self) -> None:
+        tmp_file = self.manifest_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_FORMAT_VERSION, "entries": self._manifest}, f)
+            os.replace(tmp_file, self.manifest_file)
+        except OSError as e:
+            print(f"Error saving cache manifest: {e}")
+
+    def get(self, path: str) -> Optional[dict]:
+        """Returns the cached summary of a file if it is still valid, otherwise None"""
+        key = self._key(path)
+        entry = self._manifest.get(key)
+        if entry is None:
+            return None
+
+        try:
+            stat = os.stat(path)
+            if stat.st_size != entry["size"] or self.content_hash(path, stat.st_size) != entry["hash"]:
+                self._drop(key)
+                return None
+            with gzip.open(self._entry_file(key), "rt", encoding="utf-8") as f:
+                summary = json.load(f)
+        except (OSError, ValueError, KeyError):
+            self._drop(key)
+            return None
+
+        # A touched but unchanged file keeps its entry, with the new mtime recorded
+        entry["mtime"] = stat.st_mtime_ns
+        entry["last_access"] = time.time()
+        self._save_manifest()
+        return summary
+
+    def put(self, path: str, summary: dict) -> None:
+        """Stores the summary of a file and evicts least recently used entries over the limits"""
+        key = self._key(path)
+        try:
+            stat = os.stat(path)
+            file_hash = self.content_hash(path, stat.st_size)
+            entry_file = self._entry_file(key)
+            with gzip.open(entry_file, "wt", encoding="utf-8", compresslevel=5) as f:
+                json.dump(summary, f, separators=(",", ":"))
+        except OSError as e:
+            print(f"Error writing cache entry: {e}")
+            return
+
+        self._manifest[key] = {
+            "path": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": file_hash,
+            "bytes": entry_file.stat().st_size,
+            "last_access": time.time(),
+        }
+        self._evict()
+        self._save_manifest()
+
+    def _drop(self, key: str) -> None:
+        self._manifest.pop(key, None)
+        try:
+            self._entry_file(key).unlink()
+        except OSError:
+            pass
+        self._save_manifest()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the size and count limits are met"""
+        by_age = sorted(self._manifest.items(), key=lambda item: item[1]["last_access"])
+        total_bytes = sum(entry["bytes"] for _, entry in by_age)
+
+        while by_age and (total_bytes > self.max_size_bytes or len(by_age) > self.max_entries):
+            key, entry = by_age.pop(0)
+            total_bytes -= entry["bytes"]
+            self._manifest.pop(key, None)
+            try:
+                self._entry_file(key).unlink()
+            except OSError:
+                pass
+
+    def size_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._manifest.values())
+
+    def purge(self) -> int:
+        """Deletes every cache entry and returns how many were removed"""
+        removed = 0
+        for entry_file in self.cache_dir.glob("*.json.gz"):
+            try:
+                entry_file.unlink()
+                removed += 1
+            except OSError:
+                pass
+        self._manifest = {}
+        self._save_manifest()
+        return removed
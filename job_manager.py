@@ -0,0 +1,187 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class JobCancelled(Exception):
+    """Raised when a job has been cancelled or superseded by a newer one"""
+
+
+class CancelToken:
+    """Cooperative cancellation flag and progress counter shared with a worker thread"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.done = 0
+        self.total = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def tick(self, done: int, total: int = None) -> None:
+        """Reports progress and raises JobCancelled if the job is no longer wanted"""
+        if self._event.is_set():
+            raise JobCancelled()
+        self.done = done
+        if total is not None:
+            self.total = total
+
+
+class Job:
+    def __init__(self, slot: str, label: Optional[str]):
+        self.slot = slot
+        self.label = label
+        self.token = CancelToken()
+        self.started = time.perf_counter()
+
+    def progress_text(self) -> str:
+        elapsed_time = time.perf_counter() - self.started
+        text = f"{self.label}... [{elapsed_time:.1f} sec]"
+        if self.token.total:
+            text += f" {self.token.done}/{self.token.total}"
+        return text
+
+
+class JobManager:
+    """Owns all long-running work: one job per slot, newer jobs supersede older ones"""
+
+    def __init__(self, max_workers: int = 2, on_progress: Optional[Callable[[str], None]] = None,
+                 on_error: Optional[Callable[[str, Exception], None]] = None, interval: float = 0.5):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="honey-job")
+        self._jobs = {}
+        self._flows = {}
+        self._ticker = None
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.interval = interval
+
+    def spawn(self, slot: str, coro) -> asyncio.Task:
+        """Runs a UI flow as a task, cancelling the previous flow of the same slot"""
+        previous = self._flows.get(slot)
+        if previous is not None and not previous.done():
+            previous.cancel()
+
+        task = asyncio.create_task(coro)
+        self._flows[slot] = task
+        task.add_done_callback(functools.partial(self._flow_done, slot))
+        return task
+
+    def _flow_done(self, slot: str, task: asyncio.Task) -> None:
+        if self._flows.get(slot) is task:
+            del self._flows[slot]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and not isinstance(error, JobCancelled) and self.on_error:
+            self.on_error(slot, error)
+
+    async def run(self, slot: str, label: str, func: Callable, *args, **kwargs):
+        """Runs func(*args, token=..., **kwargs) in the worker pool and returns its result.
+
+        Raises JobCancelled if the job was superseded, even when the worker has already finished,
+        so stale results never reach the UI. Jobs without a label (speculative work) are not reported.
+        """
+        self._cancel_job(slot)
+
+        job = Job(slot, label)
+        self._jobs[slot] = job
+        self._ensure_ticker()
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, functools.partial(func, *args, token=job.token, **kwargs))
+        except asyncio.CancelledError:
+            job.token.cancel()
+            raise
+        finally:
+            if self._jobs.get(slot) is job:
+                del self._jobs[slot]
+
+        if job.token.cancelled:
+            raise JobCancelled()
+        return result
+
+    async def stream(self, slot: str, label: str, func: Callable, *args, **kwargs):
+        """Runs the generator func(*args, token=..., **kwargs) in the worker pool and yields its items as they come.
+
+        Same supersession rules as run(): once the job is cancelled no further item is delivered.
+        """
+        self._cancel_job(slot)
+
+        job = Job(slot, label)
+        self._jobs[slot] = job
+        self._ensure_ticker()
+
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        finished = object()
+
+        def produce():
+            try:
+                for item in func(*args, token=job.token, **kwargs):
+                    loop.call_soon_threadsafe(items.put_nowait, (item, None))
+            except Exception as error:
+                loop.call_soon_threadsafe(items.put_nowait, (finished, error))
+            else:
+                loop.call_soon_threadsafe(items.put_nowait, (finished, None))
+
+        loop.run_in_executor(self._executor, produce)
+        try:
+            while True:
+                item, error = await items.get()
+                if job.token.cancelled:
+                    raise JobCancelled()
+                if item is finished:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            # Also reached when the consumer stops early or its task is cancelled
+            job.token.cancel()
+            if self._jobs.get(slot) is job:
+                del self._jobs[slot]
+
+    def _cancel_job(self, slot: str) -> None:
+        job = self._jobs.pop(slot, None)
+        if job is not None:
+            job.token.cancel()
+
+    def cancel(self, *slots: str) -> None:
+        """Cancels the flows and the worker jobs of the given slots"""
+        for slot in slots:
+            self._cancel_job(slot)
+            flow = self._flows.get(slot)
+            if flow is not None and not flow.done():
+                flow.cancel()
+
+    def is_busy(self, slot: str) -> bool:
+        return slot in self._jobs or slot in self._flows
+
+    def _ensure_ticker(self) -> None:
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._report_progress())
+
+    async def _report_progress(self) -> None:
+        """Reports all running jobs as one status line until none is left"""
+        while self._jobs:
+            texts = [job.progress_text() for job in self._jobs.values() if job.label]
+            if self.on_progress and texts:
+                self.on_progress(" | ".join(texts))
+            await asyncio.sleep(self.interval)
+
+    def shutdown(self) -> None:
+        for slot in list(self._jobs):
+            self._cancel_job(slot)
+        self._executor.shutdown(wait=False, cancel_futures=True)
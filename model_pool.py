@@ -0,0 +1,122 @@
+import gc
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+import psutil
+
+if TYPE_CHECKING:
+    # Both import ifcopenshell, which is only needed once a model is opened
+    from element_headers import ElementHeaders
+    from property_index import PropertyIndex
+
+
+class ModelSession:
+    """An opened IFC model together with the indexes derived from it"""
+
+    def __init__(self, path: str, ifc_file):
+        self.path = path
+        self.ifc_file = ifc_file
+        self.signature = ModelPool.file_signature(path)
+        self.summary = None
+        self.indexes = {}
+        self._lock = threading.Lock()
+
+    def get_property_index(self, token=None) -> "PropertyIndex":
+        """Builds the property definition index on first use, later calls share it"""
+        from property_index import PropertyIndex
+
+        with self._lock:
+            if "properties" not in self.indexes:
+                self.indexes["properties"] = PropertyIndex.build(self.ifc_file, token)
+            return self.indexes["properties"]
+
+    def get_element_headers(self) -> "ElementHeaders":
+        """Element header store shared by all tables of the model, seeded from the summary when there is one"""
+        from element_headers import ElementHeaders
+
+        with self._lock:
+            if "headers" not in self.indexes:
+                element_headers = ElementHeaders(self.ifc_file)
+                if self.summary and self.summary.get("headers"):
+                    element_headers.seed(self.summary["headers"])
+                self.indexes["headers"] = element_headers
+            return self.indexes["headers"]
+
+
+class ModelPool:
+    """Keeps recently opened models in memory, evicting the least recently used ones over an RSS budget"""
+
+    def __init__(self, budget_mb: float = 0):
+        if not budget_mb:
+            # Default budget: half of the physical memory
+            budget_mb = psutil.virtual_memory().total / (2 * 1024 * 1024)
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._sessions = OrderedDict()
+        self._process = psutil.Process()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def file_signature(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def rss_bytes(self) -> int:
+        return self._process.memory_info().rss
+
+    def get(self, path: str) -> Optional[ModelSession]:
+        """Returns the opened model for a path, unless the file has changed on disk since"""
+        key = self._key(path)
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+
+        try:
+            unchanged = self.file_signature(path) == session.signature
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            self.remove(path)
+            return None
+
+        self._sessions.move_to_end(key)
+        return session
+
+    def add(self, session: ModelSession) -> list:
+        """Adds a model as the most recently used one and returns the paths evicted to stay in budget"""
+        key = self._key(session.path)
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        return self._enforce_budget()
+
+    def remove(self, path: str) -> None:
+        self._sessions.pop(self._key(path), None)
+        gc.collect()
+
+    def clear(self) -> None:
+        self._sessions.clear()
+        gc.collect()
+
+    def _enforce_budget(self) -> list:
+        """Evicts least recently used models (never the current one) while the process RSS is over budget"""
+        evicted = []
+        while len(self._sessions) > 1 and self.rss_bytes() > self.budget_bytes:
+            _, session = self._sessions.popitem(last=False)
+            evicted.append(session.path)
+            del session
+            gc.collect()
+        return evicted
+
+    def paths(self) -> list:
+        """Paths of the pooled models, least recently used first"""
+        return [session.path for session in self._sessions.values()]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, path: str) -> bool:
+        return self._key(path) in self._sessions
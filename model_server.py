@@ -0,0 +1,252 @@
+"""Out-of-process model server: a worker process owns the opened models and runs the extraction loops.
+
+Extraction is pure-Python looping, so in a thread it competes with the Textual event loop for the GIL.
+In the server process it does not; the UI side only waits on a pipe, which releases the GIL, and receives
+compact columnar PropertyTable chunks (NumPy arrays plus string dictionaries) instead of Python rows.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+from job_manager import CancelToken, JobCancelled
+
+# Seconds between cancellation polls and progress reports of the server
+POLL_INTERVAL = 0.1
+PROGRESS_INTERVAL = 0.25
+
+
+class _ServerToken(CancelToken):
+    """Token of the request being served: polls the pipe for its cancel message and reports progress"""
+
+    def __init__(self, conn, request_id: int):
+        super().__init__()
+        self.conn = conn
+        self.request_id = request_id
+        self._polled = 0.0
+        self._reported = 0.0
+
+    def _poll(self) -> None:
+        now = time.perf_counter()
+        if now - self._polled < POLL_INTERVAL:
+            return
+        self._polled = now
+        while self.conn.poll():
+            request_id, method = self.conn.recv()[:2]
+            if method == "close" or (method == "cancel" and request_id == self.request_id):
+                self.cancel()
+        if now - self._reported >= PROGRESS_INTERVAL:
+            self._reported = now
+            self.conn.send(("progress", self.request_id, (self.done, self.total)))
+
+    def check(self) -> None:
+        self._poll()
+        super().check()
+
+    def tick(self, done: int, total: int = None) -> None:
+        super().tick(done, total)
+        self._poll()
+        super().check()
+
+
+class _ModelWorker:
+    """Request handlers of the server process; every request names its model, which is opened on demand"""
+
+    def __init__(self, budget_mb: float, workers: int = 0, min_elements: int = None):
+        from model_pool import ModelPool
+
+        self.pool = ModelPool(budget_mb)
+        self.workers = workers
+        self.min_elements = min_elements
+
+    def _session(self, path: str, token: CancelToken):
+        import ifcopenshell
+        from model_pool import ModelSession
+
+        session = self.pool.get(path)
+        if session is None:
+            token.check()
+            session = ModelSession(path, ifcopenshell.open(path))
+            self.pool.add(session)
+        return session
+
+    def open(self, path: str, summary: bool = True, token: CancelToken = None) -> Optional[dict]:
+        """Opens (or reuses) a model and builds its property index; returns the model summary if asked to"""
+        from index_cache import build_model_summary
+
+        session = self._session(path, token)
+        property_index = session.get_property_index(token)
+        if summary and session.summary is None:
+            session.summary = build_model_summary(session.ifc_file, property_index, token)
+        return session.summary if summary else None
+
+    def iter_parameters(self, path: str, category: Optional[str], pset: str, psets: Optional[list] = None,
+                        token: CancelToken = None) -> Iterator:
+        """Parameter table chunks of a category, or of every element carrying pset if category is None"""
+        from parallel_extraction import MIN_ELEMENTS, iter_parameters_parallel
+
+        session = self._session(path, token)
+        property_index = session.get_property_index(token)
+        elements = property_index.pset_elements(pset) if category is None else None
+        # The server itself is single-threaded, which makes it the safest place to fork from
+        return iter_parameters_parallel(session.ifc_file, category, pset, psets, token=token,
+                                        property_index=property_index, elements=elements,
+                                        element_headers=session.get_element_headers(), workers=self.workers,
+                                        min_elements=MIN_ELEMENTS if self.min_elements is None else self.min_elements)
+
+    def export_model(self, path: str, file_path: str, per_pset: bool = False, token: CancelToken = None) -> int:
+        from exporters import export_model_xlsx
+
+        session = self._session(path, token)
+        return export_model_xlsx(session.ifc_file, file_path, property_index=session.get_property_index(token),
+                                 token=token, per_pset=per_pset, element_headers=session.get_element_headers())
+
+
+def serve(conn, budget_mb: float = 0, workers: int = 0, min_elements: int = None) -> None:
+    """Main loop of the server process: one request at a time, items of generators are sent as they come"""
+    # The terminal belongs to the UI; errors travel back over the pipe instead
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    # Daemonic processes may not start children, but parallel extraction forks workers; the server
+    # still ends with the pipe of the UI, and the workers with each extraction
+    multiprocessing.current_process().daemon = False
+
+    worker = _ModelWorker(budget_mb, workers, min_elements)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        request_id, method = message[:2]
+        if method == "close":
+            break
+        if method == "cancel":
+            # The request has already finished
+            continue
+
+        args, kwargs = message[2:]
+        token = _ServerToken(conn, request_id)
+        try:
+            result = getattr(worker, method)(*args, token=token, **kwargs)
+            if isinstance(result, Iterator):
+                for item in result:
+                    conn.send(("item", request_id, item))
+                result = None
+            conn.send(("done", request_id, result))
+        except JobCancelled:
+            conn.send(("cancelled", request_id, None))
+        except Exception as e:
+            conn.send(("error", request_id, f"{type(e).__name__}: {str(e)}"))
+
+
+class ModelServer:
+    """UI-side handle of the server process; methods take a CancelToken like the in-process functions.
+
+    Requests are served one at a time. A cancelled request is told to stop and its late messages are
+    skipped by request id, so the next request does not have to wait for them to be read.
+    """
+
+    def __init__(self, budget_mb: float = 0, workers: int = 0, min_elements: int = None):
+        self.budget_mb = budget_mb
+        self.workers = workers
+        self.min_elements = min_elements
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def start(self) -> None:
+        """Starts the process now instead of on the first request; call it before Textual takes over stdio"""
+        with self._lock:
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        self._conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=serve, name="honey-model-server", daemon=True,
+                                              args=(child_conn, self.budget_mb, self.workers, self.min_elements))
+        self._process.start()
+        child_conn.close()
+
+    def _request(self, method: str, *args, token: CancelToken = None, **kwargs) -> Iterator:
+        """Yields the items of a request and returns its result; raises JobCancelled once the token is cancelled"""
+        token = token or CancelToken()
+        with self._lock:
+            self._ensure_started()
+            request_id = next(self._ids)
+            self._conn.send((request_id, method, args, kwargs))
+            cancel_sent = False
+            finished = False
+            try:
+                while True:
+                    if token.cancelled and not cancel_sent:
+                        self._conn.send((request_id, "cancel"))
+                        cancel_sent = True
+                    # Waiting on the pipe releases the GIL, the UI keeps running meanwhile
+                    if not self._conn.poll(POLL_INTERVAL):
+                        if not self._process.is_alive():
+                            raise Exception("Model server stopped unexpectedly")
+                        continue
+
+                    kind, reply_id, payload = self._conn.recv()
+                    if reply_id != request_id:
+                        continue
+                    finished = kind not in ("progress", "item")
+                    if kind == "progress":
+                        token.done, token.total = payload
+                    elif kind == "item":
+                        if not cancel_sent:
+                            yield payload
+                    elif cancel_sent or kind == "cancelled":
+                        raise JobCancelled()
+                    elif kind == "error":
+                        raise Exception(payload)
+                    else:
+                        return payload
+            finally:
+                if not finished and not cancel_sent and self._process.is_alive():
+                    # Closed early by the consumer: the server stops at its next poll
+                    try:
+                        self._conn.send((request_id, "cancel"))
+                    except OSError:
+                        pass
+
+    def _call(self, method: str, *args, token: CancelToken = None, **kwargs):
+        items = self._request(method, *args, token=token, **kwargs)
+        try:
+            while True:
+                next(items)
+        except StopIteration as stop:
+            return stop.value
+
+    def open(self, path: str, summary: bool = True, token: CancelToken = None) -> Optional[dict]:
+        return self._call("open", path, summary=summary, token=token)
+
+    def iter_parameters(self, path: str, category: Optional[str], pset: str, psets: Optional[list] = None,
+                        token: CancelToken = None) -> Iterator:
+        """Same chunks as OptimizedIFCDataProcessor.iter_parameters/iter_psets_parameters"""
+        yield from self._request("iter_parameters", path, category, pset, psets, token=token)
+
+    def export_model(self, path: str, file_path: str, per_pset: bool = False, token: CancelToken = None) -> int:
+        return self._call("export_model", path, file_path, per_pset=per_pset, token=token)
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        # A request still in flight keeps the pipe, the server is then just terminated
+        if self._lock.acquire(timeout=1):
+            try:
+                self._conn.send((0, "close"))
+            except OSError:
+                pass
+            finally:
+                self._lock.release()
+        self._process.join(timeout=2)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
@@ -0,0 +1,178 @@
+"""Timings of the operations the user waits for, kept while the app runs and shown in the timings panel.
+
+Every open, category count, pset fetch, parameter extraction and export is measured: its duration, the
+elements it went through, the rows it produced and the peak RSS of this process while it ran. The last
+samples of each stage are kept, with a histogram of their durations over fixed log-spaced buckets, so
+the same operation can be compared between versions from the JSON dump. Operations done by the model
+server or by forked workers are timed here too, their memory is not counted in the peak RSS.
+"""
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import psutil
+
+STAGES = ("open", "categories", "psets", "params", "export")
+# Upper bounds of the histogram buckets in seconds; the last bucket holds everything slower
+BUCKETS = (0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0)
+HISTORY = 200
+# Seconds between RSS samples while an operation runs
+SAMPLE_INTERVAL = 0.05
+
+
+class Measurement:
+    """One timed operation; the caller fills in elements and rows before it ends"""
+
+    __slots__ = ("stage", "label", "started", "duration", "elements", "rows", "peak_rss")
+
+    def __init__(self, stage: str, label: str = ""):
+        self.stage = stage
+        self.label = label
+        self.started = time.time()
+        self.duration = 0.0
+        self.elements: Optional[int] = None
+        self.rows: Optional[int] = None
+        self.peak_rss = 0
+
+    def to_dict(self) -> dict:
+        return {"label": self.label, "started": round(self.started, 3), "duration": round(self.duration, 4),
+                "elements": self.elements, "rows": self.rows, "peak_rss_mb": round(self.peak_rss / 2 ** 20, 1)}
+
+
+def bucket_labels() -> List[str]:
+    def seconds(bound: float) -> str:
+        return f"{bound * 1000:.0f}ms" if bound < 1 else f"{bound:.0f}s"
+
+    return [f"<{seconds(bound)}" for bound in BUCKETS] + [f">={seconds(BUCKETS[-1])}"]
+
+
+def _percentile(durations: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted durations"""
+    return durations[min(len(durations) - 1, int(fraction * len(durations)))]
+
+
+class OperationTimings:
+    """Rolling samples per stage; measure() may be used from any thread, concurrent operations included"""
+
+    def __init__(self, history: int = HISTORY, enabled: bool = True, sample_interval: float = SAMPLE_INTERVAL):
+        self.history = history
+        self.enabled = enabled
+        self.sample_interval = sample_interval
+        self._samples: Dict[str, deque] = {stage: deque(maxlen=history) for stage in STAGES}
+        self._lock = threading.Lock()
+        # Operations running now; the sampler thread raises their peak RSS while there are any
+        self._active: List[Measurement] = []
+        self._wake = threading.Event()
+        self._sampler = None
+        self._process = psutil.Process()
+        # Bumped by every recorded sample, lets the panel skip redrawing an unchanged table
+        self.version = 0
+
+    def _rss(self) -> int:
+        try:
+            return self._process.memory_info().rss
+        except psutil.Error:
+            return 0
+
+    def _sample(self) -> None:
+        while True:
+            self._wake.wait()
+            rss = self._rss()
+            with self._lock:
+                for measurement in self._active:
+                    measurement.peak_rss = max(measurement.peak_rss, rss)
+                if not self._active:
+                    self._wake.clear()
+            time.sleep(self.sample_interval)
+
+    def _begin(self, measurement: Measurement) -> None:
+        measurement.peak_rss = self._rss()
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="honey-rss-sampler", daemon=True)
+                self._sampler.start()
+            self._active.append(measurement)
+            self._wake.set()
+
+    def _end(self, measurement: Measurement, completed: bool) -> None:
+        rss = self._rss()
+        with self._lock:
+            self._active.remove(measurement)
+            if not self._active:
+                self._wake.clear()
+            if completed:
+                measurement.peak_rss = max(measurement.peak_rss, rss)
+                self._samples[measurement.stage].append(measurement)
+                self.version += 1
+
+    @contextmanager
+    def measure(self, stage: str, label: str = "") -> Iterator[Measurement]:
+        """Times the block; only blocks that complete are recorded, failed or cancelled ones would skew it"""
+        measurement = Measurement(stage, label)
+        if not self.enabled:
+            yield measurement
+            return
+        start_time = time.perf_counter()
+        self._begin(measurement)
+        completed = False
+        try:
+            yield measurement
+            completed = True
+        finally:
+            measurement.duration = time.perf_counter() - start_time
+            self._end(measurement, completed)
+
+    def samples(self, stage: str) -> List[Measurement]:
+        with self._lock:
+            return list(self._samples[stage])
+
+    def histogram(self, stage: str) -> List[int]:
+        """Sample counts per bucket of BUCKETS, one more for the slowest"""
+        counts = [0] * (len(BUCKETS) + 1)
+        for measurement in self.samples(stage):
+            counts[bisect_left(BUCKETS, measurement.duration)] += 1
+        return counts
+
+    def stats(self, stage: str) -> dict:
+        samples = self.samples(stage)
+        if not samples:
+            return {"count": 0}
+        durations = sorted(measurement.duration for measurement in samples)
+        last = samples[-1]
+        return {"count": len(samples), "last": last.duration, "p50": _percentile(durations, 0.5),
+                "p90": _percentile(durations, 0.9), "max": durations[-1],
+                "elements": last.elements, "rows": last.rows,
+                "peak_rss_mb": max(measurement.peak_rss for measurement in samples) / 2 ** 20}
+
+    def to_dict(self) -> dict:
+        from widgets.__version__ import __version__
+
+        stages = {}
+        for stage in STAGES:
+            stats = self.stats(stage)
+            stages[stage] = {
+                "stats": {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()},
+                "histogram": dict(zip(bucket_labels(), self.histogram(stage))),
+                "samples": [measurement.to_dict() for measurement in self.samples(stage)],
+            }
+        return {
+            "version": __version__,
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "history": self.history,
+            "stages": stages,
+        }
+
+    def dump(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
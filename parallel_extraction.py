@@ -0,0 +1,123 @@
+"""Parameter extraction of one category spread over forked worker processes.
+
+The parsed model, its PropertyIndex and ElementHeaders are not sent anywhere: the workers are forked
+after the model is loaded and inherit them copy-on-write. Each worker builds the rows of a contiguous
+range of elements and sends back a columnar PropertyTable chunk; the chunks are yielded in element order,
+so the result is the same table the single-threaded path produces.
+"""
+import itertools
+import multiprocessing
+import os
+import signal
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from extraction import OptimizedIFCDataProcessor
+from job_manager import CancelToken, JobCancelled
+from property_table import PropertyTable
+
+# Categories with fewer elements are extracted in the calling thread, forking would cost more than it saves
+MIN_ELEMENTS = 20000
+
+# Automatic worker count limit: every worker gradually copies the pages it touches
+MAX_AUTO_WORKERS = 8
+
+# Fork is the whole point, spawn would have to parse the model again. macOS only offers fork unsafely.
+FORK_AVAILABLE = "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+
+# Extraction states inherited by the forked workers, keyed so that concurrent extractions do not mix
+_states = {}
+_state_ids = itertools.count(1)
+
+
+def worker_count(workers: int = 0) -> int:
+    """Configured number of workers, 0 means one per usable CPU up to MAX_AUTO_WORKERS"""
+    if workers > 0:
+        return workers
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    return min(cpus, MAX_AUTO_WORKERS)
+
+
+def _init_worker() -> None:
+    # Signals of the worker must not be reported to the event loop of the forked UI process
+    signal.set_wakeup_fd(-1)
+
+
+def _extract_range(task: Tuple[int, int, int]) -> PropertyTable:
+    """Runs in a worker: rows of elements[start:stop], numbered like the single-threaded path"""
+    state_id, start, stop = task
+    elements, pset, param_keys, param_names, columns, property_index, element_headers = _states[state_id]
+
+    rows = []
+    for index in range(start, stop):
+        element = elements[index]
+        if param_keys is None:
+            rows.append(OptimizedIFCDataProcessor._build_row(
+                index + 1, element, pset, property_index.get_pset(element.id(), pset), param_names,
+                element_headers))
+        else:
+            rows.append(OptimizedIFCDataProcessor._build_multi_pset_row(
+                index + 1, element, property_index.get_psets(element.id()), param_keys, element_headers))
+    return PropertyTable.from_rows(columns, rows)
+
+
+def _ranges(total: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """A small first range so the first screenful arrives quickly, then chunk_size ranges"""
+    first = min(OptimizedIFCDataProcessor.FIRST_CHUNK_SIZE, chunk_size, total)
+    return [(0, first)] + [(start, min(start + chunk_size, total)) for start in range(first, total, chunk_size)]
+
+
+def iter_parameters_parallel(ifc_file, category: str, pset: str, psets: Optional[List[str]] = None,
+                             token: CancelToken = None, property_index=None, elements: Optional[list] = None,
+                             element_headers=None, workers: int = 0, min_elements: int = MIN_ELEMENTS,
+                             chunk_size: int = None) -> Iterator[Tuple[List[str], PropertyTable]]:
+    """Same chunks as OptimizedIFCDataProcessor.iter_parameters (or iter_psets_parameters with several psets).
+
+    Falls back to the single-threaded path without fork, without a PropertyIndex, with a single worker
+    or for categories below min_elements.
+    """
+    token = token or CancelToken()
+    chunk_size = chunk_size or OptimizedIFCDataProcessor.CHUNK_SIZE
+    multi = bool(psets and len(psets) > 1)
+    if elements is None:
+        elements = ifc_file.by_type(category)
+
+    workers = min(worker_count(workers), -(-len(elements) // chunk_size))
+    if not FORK_AVAILABLE or property_index is None or workers < 2 or len(elements) < min_elements:
+        if multi:
+            yield from OptimizedIFCDataProcessor.iter_psets_parameters(
+                ifc_file, category, psets, token, property_index, chunk_size, elements, element_headers)
+        else:
+            yield from OptimizedIFCDataProcessor.iter_parameters(
+                ifc_file, category, pset, token, property_index, chunk_size, elements, element_headers)
+        return
+
+    # The columns come from the pset definitions alone, the workers only resolve values
+    element_ids = [element.id() for element in elements]
+    token.total = len(elements)
+    if multi:
+        names = property_index.pset_property_names(element_ids, set(psets), token)
+        param_keys, param_names = OptimizedIFCDataProcessor.multi_pset_keys(names)
+        columns = OptimizedIFCDataProcessor.multi_pset_column_names(param_names)
+    else:
+        param_keys = None
+        param_names = sorted(property_index.property_names(element_ids, pset, token))
+        columns = OptimizedIFCDataProcessor.column_names(param_names)
+
+    state_id = next(_state_ids)
+    _states[state_id] = (elements, pset, param_keys, param_names, columns, property_index, element_headers)
+    try:
+        # Pool starts every worker right away, the state is in their memory from here on
+        with multiprocessing.get_context("fork").Pool(workers, _init_worker) as pool:
+            del _states[state_id]
+            tasks = [(state_id, start, stop) for start, stop in _ranges(len(elements), chunk_size)]
+            # imap keeps the task order; leaving the block terminates the workers, also on cancellation
+            for (_, _, stop), chunk in zip(tasks, pool.imap(_extract_range, tasks)):
+                token.tick(stop)
+                yield param_names, chunk
+    except JobCancelled:
+        raise
+    except Exception as e:
+        raise Exception(f"Error extracting parameters: {str(e)}")
+    finally:
+        _states.pop(state_id, None)
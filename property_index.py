@@ -0,0 +1,185 @@
+from functools import lru_cache
+
+import ifcopenshell
+import ifcopenshell.ifcopenshell_wrapper
+import ifcopenshell.util.element
+
+
+@lru_cache(maxsize=None)
+def _class_with_ancestors(schema: str, ifc_class: str) -> tuple:
+    """Returns the class and all its supertypes, e.g. IfcWallStandardCase, IfcWall, IfcBuildingElement, ..."""
+    try:
+        declaration = ifcopenshell.ifcopenshell_wrapper.schema_by_name(schema).declaration_by_name(ifc_class)
+    except Exception:
+        return (ifc_class,)
+
+    classes = []
+    while declaration is not None:
+        classes.append(declaration.name())
+        declaration = declaration.supertype()
+    return tuple(classes)
+
+
+class PropertyIndex:
+    """Maps elements to their property/quantity set definitions, built in one sweep over the model.
+
+    Lookups return the same merged dictionaries as ifcopenshell.util.element.get_psets/get_pset
+    (type psets first, overridden by occurrence psets). Returned dictionaries are shared, treat them as read-only.
+    """
+
+    def __init__(self, ifc_file):
+        self.ifc_file = ifc_file
+        self.schema = ifc_file.schema
+        self.element_definitions = {}  # element id -> [definition id, ...], type definitions first
+        self.category_psets = {}  # IFC class (and every supertype) -> {pset name, ...}
+        self.definition_names = {}  # definition id -> pset name
+        self._properties = {}  # definition id -> properties dictionary
+        self._property_names = {}  # definition id -> property names, without resolving the values
+        self._pset_elements = None  # pset name -> {element id: None}, inverted from element_definitions on demand
+
+    @classmethod
+    def build(cls, ifc_file, token=None) -> "PropertyIndex":
+        index = cls(ifc_file)
+
+        # The sweep works on the raw wrapper instances and reads attributes by position, which is several
+        # times cheaper than going through entity_instance attribute access on big models:
+        # IfcRelDefines* 4 - RelatedObjects, 5 - RelatingType/RelatingPropertyDefinition,
+        # IfcTypeObject 5 - HasPropertySets, IfcPropertySetDefinition 2 - Name
+        type_rels = ifc_file.wrapped_data.by_type("IfcRelDefinesByType")
+        property_rels = ifc_file.wrapped_data.by_type("IfcRelDefinesByProperties")
+        total = len(type_rels) + len(property_rels)
+
+        # Type psets go first, so occurrence psets override them like in get_psets
+        for i, rel in enumerate(type_rels):
+            if token:
+                token.tick(i, total)
+            definition_ids = [index._register(d) for d in (rel.get_argument(5).get_argument(5) or ())]
+            definition_ids = [definition_id for definition_id in definition_ids if definition_id]
+            if definition_ids:
+                index._add(rel.get_argument(4), definition_ids)
+
+        for i, rel in enumerate(property_rels, start=len(type_rels)):
+            if token:
+                token.tick(i, total)
+            definition = rel.get_argument(5)
+            # IFC4 also allows an IfcPropertySetDefinitionSet (a plain tuple) here, get_psets ignores it as well
+            if not isinstance(definition, tuple):
+                definition_id = index._register(definition)
+                if definition_id:
+                    index._add(rel.get_argument(4), [definition_id])
+
+        return index
+
+    def _register(self, definition) -> int:
+        """Remembers the name of a definition and returns its id (0 for unnamed ones)"""
+        definition_id = definition.id()
+        if definition_id not in self.definition_names:
+            name = definition.get_argument(2)
+            if not name:
+                return 0
+            self.definition_names[definition_id] = name
+        return definition_id
+
+    def _add(self, objects, definition_ids: list) -> None:
+        names = [self.definition_names[definition_id] for definition_id in definition_ids]
+        for obj in objects or ():
+            self.element_definitions.setdefault(obj.id(), []).extend(definition_ids)
+            for ifc_class in _class_with_ancestors(self.schema, obj.is_a()):
+                self.category_psets.setdefault(ifc_class, set()).update(names)
+
+    def properties(self, definition_id: int) -> dict:
+        """Properties of one definition, resolved once and shared by every element it is assigned to"""
+        properties = self._properties.get(definition_id)
+        if properties is None:
+            definition = self.ifc_file.by_id(definition_id)
+            properties = ifcopenshell.util.element.get_property_definition(definition) or {}
+            self._properties[definition_id] = properties
+        return properties
+
+    def definition_property_names(self, definition_id: int) -> tuple:
+        """Keys the properties dictionary of a definition will have, read by position from the raw instance"""
+        names = self._property_names.get(definition_id)
+        if names is None:
+            # IfcPropertySet 4 - HasProperties, IfcElementQuantity 5 - Quantities, both items have Name at 0
+            definition = self.ifc_file.wrapped_data.by_id(definition_id)
+            ifc_class = definition.is_a()
+            if ifc_class == "IfcPropertySet":
+                items = definition.get_argument(4)
+            elif ifc_class == "IfcElementQuantity":
+                items = definition.get_argument(5)
+            else:
+                items = None
+
+            if items is None:
+                names = tuple(self.properties(definition_id))
+            else:
+                names = tuple(item.get_argument(0) for item in items) + ("id",)
+            self._property_names[definition_id] = names
+        return names
+
+    def property_names(self, element_ids, pset_name: str, token=None) -> set:
+        """Union of the property names of a pset over the given elements, i.e. the columns of a parameter table"""
+        return self.pset_property_names(element_ids, {pset_name}, token).get(pset_name, set())
+
+    def pset_property_names(self, element_ids, pset_names=None, token=None) -> dict:
+        """Property names per pset over the given elements ({pset name: {property name, ...}}), all psets by default"""
+        names = {}
+        seen = set()
+        for i, element_id in enumerate(element_ids):
+            if token:
+                token.tick(i)
+            for definition_id in self.element_definitions.get(element_id, ()):
+                if definition_id in seen:
+                    continue
+                seen.add(definition_id)
+                pset_name = self.definition_names[definition_id]
+                if pset_names is None or pset_name in pset_names:
+                    names.setdefault(pset_name, set()).update(self.definition_property_names(definition_id))
+        return names
+
+    def _reverse_index(self) -> dict:
+        """Pset name -> ids of the elements carrying it (via occurrence or type), in model order"""
+        if self._pset_elements is None:
+            pset_elements = {}
+            names = self.definition_names
+            for element_id, definition_ids in self.element_definitions.items():
+                for definition_id in definition_ids:
+                    # A dict keeps the order and drops an element that has the pset from both type and occurrence
+                    pset_elements.setdefault(names[definition_id], {})[element_id] = None
+            self._pset_elements = pset_elements
+        return self._pset_elements
+
+    def pset_counts(self) -> dict:
+        """Number of elements per pset name, over all classes"""
+        return {name: len(element_ids) for name, element_ids in self._reverse_index().items()}
+
+    def pset_elements(self, pset_name: str) -> list:
+        """Every element carrying a pset regardless of its class, grouped by class like the category pane"""
+        elements = [self.ifc_file.by_id(element_id) for element_id in self._reverse_index().get(pset_name, ())]
+        elements.sort(key=lambda element: element.is_a())
+        return elements
+
+    def pset_names(self, category: str) -> list:
+        """Sorted names of the property and quantity sets used by elements of a category (incl. subtypes)"""
+        return sorted(self.category_psets.get(category, ()))
+
+    def get_psets(self, element_id: int, psets_only: bool = False, qtos_only: bool = False) -> dict:
+        psets = {}
+        for definition_id in self.element_definitions.get(element_id, ()):
+            if psets_only and not self.ifc_file.by_id(definition_id).is_a("IfcPropertySet"):
+                continue
+            if qtos_only and not self.ifc_file.by_id(definition_id).is_a("IfcElementQuantity"):
+                continue
+            name = self.definition_names[definition_id]
+            properties = self.properties(definition_id)
+            psets[name] = {**psets[name], **properties} if name in psets else properties
+        return psets
+
+    def get_pset(self, element_id: int, pset_name: str) -> dict:
+        pset = None
+        for definition_id in self.element_definitions.get(element_id, ()):
+            if self.definition_names[definition_id] != pset_name:
+                continue
+            properties = self.properties(definition_id)
+            pset = properties if pset is None else {**pset, **properties}
+        return pset or {}
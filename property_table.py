@@ -0,0 +1,185 @@
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+BOOL = "bool"
+INT = "int"
+FLOAT = "float"
+STRING = "string"
+
+
+class Column:
+    """One typed column: a NumPy value array plus a null mask.
+
+    Strings are dictionary-encoded, values holds int32 codes into categories.
+    """
+
+    __slots__ = ("kind", "values", "nulls", "categories")
+
+    def __init__(self, kind: str, values: np.ndarray, nulls: np.ndarray, categories: Optional[list] = None):
+        self.kind = kind
+        self.values = values
+        self.nulls = nulls
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_values(cls, values: Sequence) -> "Column":
+        """Picks the narrowest kind that holds every non-null value; anything else is stored as text"""
+        nulls = np.fromiter((value is None or value == "" for value in values), dtype=np.bool_, count=len(values))
+        kinds = {type(value) for value, null in zip(values, nulls) if not null}
+
+        try:
+            if kinds == {bool}:
+                return cls(BOOL, np.array([bool(value) if not null else False
+                                           for value, null in zip(values, nulls)], dtype=np.bool_), nulls)
+            if kinds == {int}:
+                return cls(INT, np.array([value if not null else 0
+                                          for value, null in zip(values, nulls)], dtype=np.int64), nulls)
+            if kinds and kinds <= {int, float}:
+                return cls(FLOAT, np.array([value if not null else np.nan
+                                            for value, null in zip(values, nulls)], dtype=np.float64), nulls)
+        except OverflowError:
+            pass
+
+        return cls.from_strings([None if null else str(value) for value, null in zip(values, nulls)], nulls)
+
+    @classmethod
+    def from_strings(cls, values: Sequence[Optional[str]], nulls: np.ndarray) -> "Column":
+        lookup = {}
+        codes = np.fromiter((lookup.setdefault(value, len(lookup)) if value is not None else -1 for value in values),
+                            dtype=np.int32, count=len(values))
+        return cls(STRING, codes, nulls, list(lookup))
+
+    def value(self, index: int):
+        """Python value of a cell, None for nulls"""
+        if self.nulls[index]:
+            return None
+        if self.kind == STRING:
+            return self.categories[self.values[index]]
+        return self.values[index].item()
+
+    def to_list(self, start: int = 0, stop: Optional[int] = None) -> list:
+        """Python values of rows start:stop; only that slice of the arrays is converted"""
+        values = self.values[start:stop].tolist()
+        if self.kind == STRING:
+            categories = self.categories
+            return [None if code < 0 else categories[code] for code in values]
+        return [None if null else value for value, null in zip(values, self.nulls[start:stop].tolist())]
+
+    @classmethod
+    def concat(cls, columns: List["Column"]) -> "Column":
+        """Joins column chunks, promoting bool/int/float to the widest numeric kind or falling back to text"""
+        if len(columns) == 1:
+            return columns[0]
+
+        nulls = np.concatenate([column.nulls for column in columns])
+        kinds = {column.kind for column in columns}
+        if len(kinds) == 1 and STRING not in kinds:
+            return cls(kinds.pop(), np.concatenate([column.values for column in columns]), nulls)
+        if kinds <= {INT, FLOAT}:
+            return cls(FLOAT, np.concatenate([column.values.astype(np.float64) for column in columns]), nulls)
+
+        values = []
+        for column in columns:
+            if column.kind == STRING:
+                values.extend(column.to_list())
+            else:
+                values.extend(None if value is None else str(value) for value in column.to_list())
+        return cls.from_strings(values, nulls)
+
+
+class PropertyTable:
+    """Columnar table of extracted parameters, appended chunk by chunk while rows are streamed in.
+
+    Cells keep their IFC value types; None marks a missing value. Formatting for display or
+    export happens on access, so only the cells actually shown or written are ever turned into text.
+    """
+
+    def __init__(self, column_names: Sequence[str] = ()):
+        self.column_names = list(column_names)
+        self._chunks: List[List[Column]] = []
+        self._starts: List[int] = []
+        self._length = 0
+
+    @classmethod
+    def from_rows(cls, column_names: Sequence[str], rows: Sequence[Sequence]) -> "PropertyTable":
+        table = cls(column_names)
+        if rows:
+            table._chunks.append([Column.from_values([row[i] for row in rows]) for i in range(len(column_names))])
+            table._starts.append(0)
+            table._length = len(rows)
+        return table
+
+    @classmethod
+    def from_columns(cls, column_names: Sequence[str], columns: List[Column]) -> "PropertyTable":
+        table = cls(column_names)
+        if columns and len(columns[0]):
+            table._chunks.append(list(columns))
+            table._starts.append(0)
+            table._length = len(columns[0])
+        return table
+
+    def __len__(self) -> int:
+        return self._length
+
+    def extend(self, other: "PropertyTable") -> None:
+        if not len(other):
+            return
+        if not self.column_names:
+            self.column_names = list(other.column_names)
+        for chunk in other._chunks:
+            self._starts.append(self._length)
+            self._chunks.append(chunk)
+            self._length += len(chunk[0])
+
+    def _locate(self, row: int):
+        chunk_index = bisect_right(self._starts, row) - 1
+        return self._chunks[chunk_index], row - self._starts[chunk_index]
+
+    def value(self, row: int, column: int):
+        chunk, offset = self._locate(row)
+        return chunk[column].value(offset)
+
+    def row(self, row: int) -> list:
+        chunk, offset = self._locate(row)
+        return [column.value(offset) for column in chunk]
+
+    def iter_rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[list]:
+        """Python value rows, decoded chunk by chunk"""
+        stop = self._length if stop is None else min(stop, self._length)
+        for chunk_start, chunk in zip(self._starts, self._chunks):
+            chunk_stop = chunk_start + len(chunk[0])
+            if chunk_stop <= start or chunk_start >= stop:
+                continue
+            lo, hi = max(start, chunk_start) - chunk_start, min(stop, chunk_stop) - chunk_start
+            yield from zip(*(column.to_list(lo, hi) for column in chunk))
+
+    def column(self, name_or_index) -> Column:
+        """The whole column as one typed array, e.g. for sorting or statistics"""
+        index = name_or_index if isinstance(name_or_index, int) else self.column_names.index(name_or_index)
+        if not self._chunks:
+            return Column.from_values([])
+        return Column.concat([chunk[index] for chunk in self._chunks])
+
+    def consolidate(self) -> None:
+        """Merges the streamed chunks into one, so column access no longer has to concatenate"""
+        if len(self._chunks) > 1:
+            self._chunks = [[self.column(i) for i in range(len(self.column_names))]]
+            self._starts = [0]
+
+    @staticmethod
+    def format_value(value, null_text: str = "Empty") -> str:
+        if value is None:
+            return null_text
+        return str(value)
+
+    def format(self, row: int, column: int) -> str:
+        return self.format_value(self.value(row, column))
+
+    def nbytes(self) -> int:
+        return sum(column.values.nbytes + column.nulls.nbytes for chunk in self._chunks for column in chunk)
+
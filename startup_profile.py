@@ -0,0 +1,136 @@
+"""Cold-start timings of the application, reported with --startup-profile.
+
+Imports are timed by wrapping builtins.__import__ from the first line of app.py until the first frame
+is painted: every module imported for the first time gets its cumulative time and its own share without
+the modules it imported in turn. Stages are marked on the way (imports done, app created, mounted,
+first paint, warm-up done) and measured from the start of the process; for a one-file build that is the
+start of the bootloader, so unpacking the archive shows up as the time before Python.
+"""
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Imports below this many seconds are left out of the text report, to_dict keeps them
+MIN_REPORTED = 0.002
+TOP_MODULES = 15
+
+
+class StartupProfile:
+    """Collects import and stage timings; nothing is recorded until start() and after stop_imports()"""
+
+    def __init__(self, output_path: Optional[str] = None):
+        self.output_path = output_path
+        self.started = time.perf_counter()
+        self.started_wall = time.time()
+        # (module, cumulative seconds, own seconds, nesting depth) in the order the imports completed
+        self.imports: List[Tuple[str, float, float, int]] = []
+        # (stage, seconds since start())
+        self.stages: List[Tuple[str, float]] = []
+        self.warm_up: List[Tuple[str, float]] = []
+        self._stack: List[float] = []
+        self._original_import = None
+        self._thread = threading.get_ident()
+
+    def start(self) -> "StartupProfile":
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        return self
+
+    def stop_imports(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative imports are counted in the module doing them, loaded modules cost a dict lookup;
+        # imports of other threads would tangle the nesting and are left to the importing module too
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        start_time = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports.append((name, elapsed, elapsed - children, len(self._stack)))
+
+    def before_python(self) -> float:
+        """Seconds between the start of the process (or of the one-file bootloader) and start()"""
+        try:
+            import psutil
+
+            process = psutil.Process()
+            if getattr(sys, "frozen", False):
+                # The one-file bootloader unpacks the archive, then starts the same executable again
+                parent = process.parent()
+                if parent is not None and parent.exe() == process.exe():
+                    process = parent
+            return max(0.0, self.started_wall - process.create_time())
+        except Exception:
+            return 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def mark(self, stage: str) -> None:
+        self.stages.append((stage, self.elapsed()))
+
+    def record_warm_up(self, module: str, seconds: float) -> None:
+        self.warm_up.append((module, seconds))
+
+    def to_dict(self) -> dict:
+        return {
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "before_python": round(self.before_python(), 4),
+            "stages": {stage: round(seconds, 4) for stage, seconds in self.stages},
+            "imports": [{"module": name, "cumulative": round(cumulative, 4), "self": round(own, 4), "depth": depth}
+                        for name, cumulative, own, depth in self.imports],
+            "warm_up": {module: round(seconds, 4) for module, seconds in self.warm_up},
+        }
+
+    def save(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def finish(self) -> None:
+        """Prints the report once the terminal is back, and writes the JSON file if one was asked for"""
+        self.stop_imports()
+        print(self.report())
+        if self.output_path:
+            self.save(self.output_path)
+            print(f"\nStartup profile written to {self.output_path}")
+
+    def report(self) -> str:
+        before = self.before_python()
+        runtime = "frozen build" if getattr(sys, "frozen", False) else f"Python {sys.version.split()[0]}"
+        lines = [f"Startup profile ({runtime}, pid {os.getpid()})", "",
+                 f"{'Stage':<28}{'Since start':>12}{'Step':>10}",
+                 f"{'process start -> python':<28}{before:>12.3f}{before:>10.3f}"]
+        previous = 0.0
+        for stage, seconds in self.stages:
+            lines.append(f"{stage:<28}{before + seconds:>12.3f}{seconds - previous:>10.3f}")
+            previous = seconds
+
+        top_level = sorted((entry for entry in self.imports if entry[3] == 0 and entry[1] >= MIN_REPORTED),
+                           key=lambda entry: -entry[1])
+        if top_level:
+            lines += ["", f"{'Imported by app.py':<40}{'Total':>10}", *(
+                f"{name:<40}{cumulative:>10.3f}" for name, cumulative, _, _ in top_level)]
+
+        heaviest = sorted(self.imports, key=lambda entry: -entry[2])[:TOP_MODULES]
+        if heaviest:
+            lines += ["", f"{'Heaviest modules (own time)':<40}{'Own':>10}{'Total':>10}", *(
+                f"{name:<40}{own:>10.3f}{cumulative:>10.3f}" for name, cumulative, own, _ in heaviest)]
+
+        if self.warm_up:
+            lines += ["", f"{'Warmed up after first paint':<40}{'Time':>10}", *(
+                f"{module:<40}{seconds:>10.3f}" for module, seconds in self.warm_up)]
+        return "\n".join(lines)
@@ -0,0 +1,209 @@
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Iterator, Optional
+
+
+CHUNK_SIZE = 8 * 1024 * 1024
+HEADER_LIMIT = 256 * 1024  # The HEADER section is expected within the first bytes of a file
+SUMMARY_PREFIX = 1024 * 1024  # Bytes read by scan_summary, smaller files are counted exactly
+SUMMARY_TAIL = 64 * 1024  # Read backwards from the end until an instance starts, SUMMARY_TAIL_LIMIT at most
+SUMMARY_TAIL_LIMIT = 1024 * 1024
+
+# Entity instances are written one per line by every common exporter, which keeps the pattern cheap
+ENTITY_RE = re.compile(rb"^#\d+[ \t]*=[ \t]*([A-Za-z0-9_]+)", re.MULTILINE)
+STRING_RE = re.compile(r"'((?:[^']|'')*)'")
+ENTITY_ID_RE = re.compile(rb"^#(\d+)[ \t]*=", re.MULTILINE)
+
+
+def _header_strings(header: str, record: str) -> list:
+    """Returns the quoted string arguments of a HEADER record such as FILE_NAME"""
+    match = re.search(rf"{record}\s*\((.*?)\)\s*;", header, re.DOTALL)
+    if not match:
+        return []
+    return [value.replace("''", "'") for value in STRING_RE.findall(match.group(1))]
+
+
+def scan_header(path: str, limit: int = HEADER_LIMIT) -> dict:
+    """Reads schema, authoring tool and timestamp from the STEP HEADER section"""
+    with open(path, "rb") as f:
+        return _parse_header(f.read(limit).decode("latin-1"))
+
+
+def _parse_header(head: str) -> dict:
+    end = head.find("ENDSEC;")
+    header = head[:end] if end != -1 else head
+
+    # FILE_NAME(name, time_stamp, (author), (organization), preprocessor_version, originating_system, authorization)
+    file_name = _header_strings(header, "FILE_NAME")
+    file_schema = _header_strings(header, "FILE_SCHEMA")
+
+    # Author and organization lists shift the positional strings, so take the tail ones from the end
+    return {
+        "schema": file_schema[0].upper() if file_schema else None,
+        "name": file_name[0] if file_name else None,
+        "timestamp": file_name[1] if len(file_name) > 1 else None,
+        "preprocessor": file_name[-3] if len(file_name) >= 5 else None,
+        "originating_system": file_name[-2] if len(file_name) >= 5 else None,
+    }
+
+
+def scan_summary(path: str, prefix: int = SUMMARY_PREFIX) -> dict:
+    """scan_header plus the number of entity instances, from at most prefix bytes and the tail of the file.
+
+    Files within the prefix are counted exactly. For larger ones the id of the last instance is taken,
+    exporters number instances consecutively; without one in the tail the prefix density is extrapolated.
+    """
+    last_id = None
+    with open(path, "rb") as f:
+        head = f.read(prefix)
+        size = f.seek(0, os.SEEK_END)
+        tail = b""
+        # Relationships listing thousands of elements make for long last lines
+        while size > prefix and last_id is None and len(tail) < SUMMARY_TAIL_LIMIT:
+            start = max(prefix, size - len(tail) - SUMMARY_TAIL)
+            if start == size - len(tail):
+                break
+            f.seek(start)
+            tail = f.read(size - len(tail) - start) + tail
+            last_id = _last_entity_id(tail)
+
+    summary = _parse_header(head[:HEADER_LIMIT].decode("latin-1"))
+    summary["exact"] = size <= prefix
+    if summary["exact"]:
+        summary["entities"] = len(ENTITY_RE.findall(head))
+        return summary
+
+    if last_id is not None:
+        summary["entities"] = last_id
+    else:
+        # The tail is one huge line (a point list, say), so the ids of the prefix are all there is
+        data_start = head.find(b"DATA;")
+        counted = len(ENTITY_RE.findall(head))
+        summary["entities"] = int(counted * (size - max(data_start, 0)) / max(len(head) - max(data_start, 0), 1))
+    return summary
+
+
+def _last_entity_id(data: bytes) -> Optional[int]:
+    # Searched backwards line by line: a multiline ^ pattern over the whole tail costs milliseconds
+    end = len(data)
+    while True:
+        start = data.rfind(b"\n#", 0, end)
+        if start == -1:
+            return None
+        match = ENTITY_ID_RE.match(data, start + 1)
+        if match:
+            return int(match.group(1))
+        end = start
+
+
+def scan_entities(path: str, progress: Optional[Callable[[int, int], None]] = None) -> Counter:
+    """Tallies entity class names (upper case, as written) in the DATA section in one streaming pass"""
+    counts = Counter()
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        total = f.tell()
+        f.seek(0)
+
+        carry = b""
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            # Only complete lines are matched, the rest is carried over to the next chunk
+            data = carry + chunk
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            counts.update(ENTITY_RE.findall(data, 0, cut))
+
+            if progress:
+                progress(f.tell(), total)
+
+        if carry:
+            counts.update(ENTITY_RE.findall(carry))
+
+    return Counter({name.decode("ascii").upper(): amount for name, amount in counts.items()})
+
+
+def iter_matches(path: str, pattern: re.Pattern, progress: Optional[Callable[[int, int], None]] = None
+                 ) -> Iterator[re.Match]:
+    """Streams the file chunk by chunk and yields the matches of a MULTILINE bytes pattern within whole lines"""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        total = f.tell()
+        f.seek(0)
+
+        carry = b""
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            data = carry + chunk
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            yield from pattern.finditer(data, 0, cut)
+
+            if progress:
+                progress(f.tell(), total)
+
+        if carry:
+            yield from pattern.finditer(carry)
+
+
+@lru_cache(maxsize=None)
+def schema_ancestors(schema: str) -> dict:
+    """Maps upper case entity names to (IFC class name, names of the class and all its supertypes)"""
+    import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+    classes = {}
+    for entity in wrapper.schema_by_name(schema).entities():
+        ancestors = []
+        parent = entity
+        while parent is not None:
+            ancestors.append(parent.name())
+            parent = parent.supertype()
+        classes[entity.name().upper()] = (entity.name(), tuple(ancestors))
+    return classes
+
+
+@lru_cache(maxsize=None)
+def _schema_classes(schema: str) -> dict:
+    """Maps upper case entity names to (IFC class name, is IfcElement, is IfcProduct) for a schema"""
+    return {name: (ifc_class, "IfcElement" in ancestors, "IfcProduct" in ancestors)
+            for name, (ifc_class, ancestors) in schema_ancestors(schema).items()}
+
+
+def scan_preview(path: str, progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """Builds an approximate model summary (same keys as the index cache) without parsing the model"""
+    header = scan_header(path)
+    counts = scan_entities(path, progress)
+
+    try:
+        classes = _schema_classes(header["schema"])
+    except Exception:
+        classes = {}
+
+    categories = {}
+    products = 0
+    for name, amount in counts.items():
+        ifc_class, is_element, is_product = classes.get(name, (name, False, False))
+        if is_element:
+            categories[ifc_class] = amount
+        if is_product:
+            products += amount
+
+    return {
+        "schema": header["schema"],
+        "header": header,
+        "products": products,
+        "categories": categories,
+    }
@@ -0,0 +1,405 @@
+"""Low-memory access to IFC files that are too big to parse.
+
+ifcopenshell.open keeps the whole entity graph in memory, geometry included, at roughly ten times the
+file size. A StreamingModel streams the DATA section instead and keeps only what the panes need:
+
+- the first pass (build) collects the elements with their header columns, the product count, the names of
+  the property and quantity sets and which sets every element (or its type) uses; no geometry, no values;
+- a second pass per requested table (iter_parameters) reads the values of exactly the properties of the
+  requested elements and sets.
+
+Like step_scanner it relies on one entity instance per line, as every common exporter writes them.
+Predefined property sets (IfcDoorLiningProperties and the like) and complex properties are not indexed.
+"""
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psutil
+
+from extraction import OptimizedExtractParametersHelper, OptimizedIFCDataProcessor
+from job_manager import CancelToken, JobCancelled
+from model_pool import ModelPool
+from property_table import PropertyTable
+from step_scanner import iter_matches, scan_header, schema_ancestors
+
+# Approximate RSS of a parsed and indexed model per byte of its file
+PARSED_BYTES_PER_FILE_BYTE = 10
+
+# Entity instance with its class and the text between the outer parentheses; %s is an alternation of classes
+RECORD_TEMPLATE = r"^#(\d+)[ \t]*=[ \t]*(%s)[ \t]*\((.*)\)[ \t]*;"
+
+PROPERTY_SET = "IFCPROPERTYSET"
+ELEMENT_QUANTITY = "IFCELEMENTQUANTITY"
+REL_BY_PROPERTIES = "IFCRELDEFINESBYPROPERTIES"
+REL_BY_TYPE = "IFCRELDEFINESBYTYPE"
+
+# Property classes read by the value pass; the position of the value is fixed per class
+LIST_PROPERTIES = ("IFCPROPERTYENUMERATEDVALUE", "IFCPROPERTYLISTVALUE")
+QUANTITIES = ("IFCQUANTITYLENGTH", "IFCQUANTITYAREA", "IFCQUANTITYVOLUME", "IFCQUANTITYCOUNT",
+              "IFCQUANTITYWEIGHT", "IFCQUANTITYTIME", "IFCQUANTITYNUMBER")
+
+# One token per match, told apart by lastindex: 1 string, 2 reference, 3 enumeration, 4 typed value,
+# 5 list start, 6 end of list or typed value, 7 number, 8 null ($) or derived (*); commas are skipped
+TOKEN_RE = re.compile(r"[ \t\r\n]*(?:'((?:[^']|'')*)'|#(\d+)|\.([A-Za-z0-9_]+)\.|([A-Za-z][A-Za-z0-9_]*)[ \t]*\("
+                      r"|(\()|(\))|([-+]?\d+\.?\d*(?:[Ee][-+]?\d+)?)|([$*])|,)")
+ENCODED_RE = re.compile(r"\\X2\\((?:[0-9A-Fa-f]{4})+)\\X0\\|\\X4\\((?:[0-9A-Fa-f]{8})+)\\X0\\"
+                        r"|\\X\\([0-9A-Fa-f]{2})|\\S\\(.)|\\\\")
+ENUMERATIONS = {"T": True, "F": False, "U": "UNKNOWN"}
+
+# Relationships are the most numerous records; their related objects and the relating definition or type
+# end every IfcRelDefinesBy* record and are read without parsing the rest
+REL_TAIL_RE = re.compile(rb"\(([^()]*)\)[ \t]*,[ \t]*#(\d+)[ \t]*$")
+REFERENCE_RE = re.compile(rb"#(\d+)")
+
+
+def _alternation(names) -> str:
+    """Regex matching any of the names, nested as a prefix tree.
+
+    A flat alternation of a few hundred class names tries every name on every line that matches none,
+    which is most lines of a model; the tree rejects them after a few characters.
+    """
+    tree = {}
+    for name in names:
+        node = tree
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def branch(node: dict) -> str:
+        branches = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A name that is also the prefix of a longer one ends here or continues
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return branch(tree)
+
+
+def _record_pattern(names) -> re.Pattern:
+    return re.compile((RECORD_TEMPLATE % _alternation(names)).encode("ascii"), re.MULTILINE)
+
+
+PROPERTY_RE = _record_pattern(("IFCPROPERTYSINGLEVALUE",) + LIST_PROPERTIES + QUANTITIES)
+
+
+def needs_streaming(path: str) -> bool:
+    """Whether parsing the file would likely not fit into the memory available right now"""
+    return os.path.getsize(path) * PARSED_BYTES_PER_FILE_BYTE > psutil.virtual_memory().available
+
+
+def _decode_match(match: re.Match) -> str:
+    utf16, utf32, byte, shifted = match.groups()
+    if utf16:
+        return bytes.fromhex(utf16).decode("utf-16-be")
+    if utf32:
+        return bytes.fromhex(utf32).decode("utf-32-be")
+    if byte:
+        return chr(int(byte, 16))
+    if shifted:
+        return chr(ord(shifted) + 128)
+    return "\\"
+
+
+def decode_string(value: str) -> str:
+    """Text of a STEP string without its quotes: doubled quotes and \\X2\\, \\X4\\, \\X\\, \\S\\ escapes resolved"""
+    value = value.replace("''", "'")
+    return ENCODED_RE.sub(_decode_match, value) if "\\" in value else value
+
+
+def _text(raw: bytes) -> str:
+    # Escapes are the standard, but raw UTF-8 is common and anything else is taken as latin-1
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def parse_arguments(text: str) -> list:
+    """Arguments of an entity instance as Python values.
+
+    References become entity ids, typed values like IFCLABEL('x') their wrapped value, .T./.F. booleans,
+    other enumerations their name, aggregates lists and $ or * None.
+    """
+    current = []
+    stack = []
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastindex
+        if kind is None:
+            continue
+        if kind == 1:
+            current.append(decode_string(match.group(1)))
+        elif kind == 2:
+            current.append(int(match.group(2)))
+        elif kind == 3:
+            current.append(ENUMERATIONS.get(match.group(3), match.group(3)))
+        elif kind == 4 or kind == 5:
+            stack.append((current, kind == 4))
+            current = []
+        elif kind == 6:
+            if not stack:
+                break
+            parent, typed = stack.pop()
+            parent.append((current[0] if current else None) if typed else current)
+            current = parent
+        elif kind == 7:
+            number = match.group(7)
+            current.append(float(number) if "." in number or "E" in number.upper() else int(number))
+        elif kind == 8:
+            current.append(None)
+    return current
+
+
+def _property_value(ifc_class: str, arguments: list) -> Tuple[str, object]:
+    """(name, value) of a property or quantity, the value as ifcopenshell.util.element returns it"""
+    if ifc_class in QUANTITIES:
+        # 3 IfcPhysicalSimpleQuantity.XXXValue
+        return arguments[0], arguments[3]
+    # 2 IfcPropertySingleValue.NominalValue, IfcPropertyEnumeratedValue.EnumerationValues, ...
+    value = arguments[2] if len(arguments) > 2 else None
+    if ifc_class in LIST_PROPERTIES and value is not None:
+        value = list(value)
+    return arguments[0], value
+
+
+class StreamingModel:
+    """Indexes of an IFC file built by streaming it, answering the panes without holding the model.
+
+    Element ids stand in for the entity instances: get() returns the same header tuple as ElementHeaders,
+    so the rows are built by the regular OptimizedIFCDataProcessor row builders.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        self.signature = ModelPool.file_signature(path)
+        self.products = 0
+        self.elements = {}  # element id -> (IFC class, raw Name, PredefinedType, GlobalId)
+        self.element_definitions = {}  # element id -> [definition id, ...], type definitions first
+        self.definition_names = {}  # definition id -> pset name
+        self.definition_items = {}  # definition id -> ids of its properties or quantities
+        self.category_psets = {}  # IFC class (and every supertype) -> {pset name, ...}
+        self._ancestors = {}  # IFC class -> the class and its supertypes
+        self._pset_elements = None
+
+    @classmethod
+    def build(cls, path: str, token: CancelToken = None) -> "StreamingModel":
+        """First pass: one sequential read of the file, keeping elements and property set assignments only"""
+        token = token or CancelToken()
+        header = scan_header(path)
+        model = cls(path, header["schema"])
+
+        import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+        declarations = wrapper.schema_by_name(model.schema)
+        classes = schema_ancestors(model.schema)
+        elements, products, types = {}, set(), set()
+        for name, (ifc_class, ancestors) in classes.items():
+            if "IfcElement" in ancestors:
+                # PredefinedType sits at a different position for every class, if the class has one
+                attributes = [attribute.name() for attribute in declarations.declaration_by_name(ifc_class)
+                              .all_attributes()]
+                elements[name] = attributes.index("PredefinedType") if "PredefinedType" in attributes else None
+                model._ancestors[ifc_class] = ancestors
+            elif "IfcProduct" in ancestors:
+                products.add(name)
+            elif "IfcTypeObject" in ancestors:
+                types.add(name)
+
+        pattern = _record_pattern(list(elements) + list(products) + list(types) +
+                                  [PROPERTY_SET, ELEMENT_QUANTITY, REL_BY_PROPERTIES, REL_BY_TYPE])
+
+        type_psets = {}  # type object id -> [definition id, ...]
+        type_rels = []
+        property_rels = []
+        for match in iter_matches(path, pattern, token.tick):
+            entity_id = int(match.group(1))
+            name = match.group(2).decode("ascii")
+            if name == REL_BY_PROPERTIES or name == REL_BY_TYPE:
+                # 4 RelatedObjects, 5 RelatingPropertyDefinition or RelatingType; a set of definitions in
+                # place of the relating one does not match and is ignored like get_psets does
+                tail = REL_TAIL_RE.search(match.group(3))
+                if tail is not None:
+                    related = [int(object_id) for object_id in REFERENCE_RE.findall(tail.group(1))]
+                    (property_rels if name == REL_BY_PROPERTIES else type_rels).append((related, int(tail.group(2))))
+                continue
+
+            arguments = parse_arguments(_text(match.group(3)))
+            if name in elements:
+                # IfcRoot: 0 GlobalId, 2 Name
+                position = elements[name]
+                predefined_type = arguments[position] if position is not None and position < len(arguments) else None
+                model.elements[entity_id] = (classes[name][0], arguments[2], predefined_type, arguments[0])
+                model.products += 1
+            elif name in products:
+                model.products += 1
+            elif name == PROPERTY_SET or name == ELEMENT_QUANTITY:
+                # 2 Name; IfcPropertySet 4 HasProperties, IfcElementQuantity 5 Quantities
+                if arguments[2]:
+                    model.definition_names[entity_id] = arguments[2]
+                    model.definition_items[entity_id] = tuple(arguments[4 if name == PROPERTY_SET else 5] or ())
+            else:
+                # IfcTypeObject 5 HasPropertySets
+                type_psets[entity_id] = arguments[5] or ()
+
+        # Type psets go first, so occurrence psets override them like in get_psets
+        for objects, type_id in type_rels:
+            model._add(objects, [definition_id for definition_id in type_psets.get(type_id, ())
+                                 if definition_id in model.definition_names])
+        for objects, definition_id in property_rels:
+            if definition_id in model.definition_names:
+                model._add(objects, [definition_id])
+        return model
+
+    def _add(self, objects, definition_ids: list) -> None:
+        if not definition_ids:
+            return
+        names = [self.definition_names[definition_id] for definition_id in definition_ids]
+        for object_id in objects or ():
+            element = self.elements.get(object_id)
+            if element is None:
+                continue
+            self.element_definitions.setdefault(object_id, []).extend(definition_ids)
+            for ifc_class in self._ancestors[element[0]]:
+                self.category_psets.setdefault(ifc_class, set()).update(names)
+
+    def get(self, element_id: int) -> Tuple:
+        """Same tuple as ElementHeaders.get: cleaned Name, class, PredefinedType and GlobalId"""
+        ifc_class, name, predefined_type, guid = self.elements[element_id]
+        return OptimizedExtractParametersHelper.clean_name(name), ifc_class, predefined_type, guid
+
+    def summary(self) -> dict:
+        """Model summary with the same keys as index_cache.build_model_summary"""
+        categories = {}
+        headers = {}
+        for element_id, (ifc_class, name, predefined_type, guid) in self.elements.items():
+            categories[ifc_class] = categories.get(ifc_class, 0) + 1
+            headers.setdefault(ifc_class, []).append([element_id, name, str(predefined_type or ""), guid])
+
+        return {
+            "schema": self.schema,
+            "products": self.products,
+            "categories": categories,
+            "psets": {category: self.pset_names(category) for category in categories},
+            "pset_counts": {name: len(element_ids) for name, element_ids in self._reverse_index().items()},
+            "headers": headers,
+        }
+
+    def pset_names(self, category: str) -> list:
+        return sorted(self.category_psets.get(category, ()))
+
+    def _reverse_index(self) -> dict:
+        """Pset name -> ids of the elements carrying it, like PropertyIndex._reverse_index"""
+        if self._pset_elements is None:
+            pset_elements = {}
+            for element_id, definition_ids in self.element_definitions.items():
+                for definition_id in definition_ids:
+                    pset_elements.setdefault(self.definition_names[definition_id], {})[element_id] = None
+            self._pset_elements = pset_elements
+        return self._pset_elements
+
+    def category_elements(self, category: str) -> List[int]:
+        """Ids of the elements of a class and its subclasses, in the order of by_type.
+
+        Grouped by class down the schema tree, a class before its subclasses and siblings by name; within a
+        class in file order. Low-memory mode then yields the same rows in the same order as a parsed model.
+        """
+        element_ids = [element_id for element_id, (ifc_class, *_) in self.elements.items()
+                       if category in self._ancestors[ifc_class]]
+        element_ids.sort(key=lambda element_id: self._ancestors[self.elements[element_id][0]][::-1])
+        return element_ids
+
+    def pset_elements(self, pset_name: str) -> List[int]:
+        """Ids of every element carrying a pset, grouped by class like PropertyIndex.pset_elements"""
+        element_ids = list(self._reverse_index().get(pset_name, ()))
+        element_ids.sort(key=lambda element_id: self.elements[element_id][0])
+        return element_ids
+
+    def read_definitions(self, definition_ids: set, token: CancelToken = None) -> Dict[int, dict]:
+        """Second pass: properties dictionaries of the given definitions, like get_property_definition"""
+        token = token or CancelToken()
+        wanted = {item_id for definition_id in definition_ids for item_id in self.definition_items[definition_id]}
+        values = {}
+        if wanted:
+            for match in iter_matches(self.path, PROPERTY_RE, token.tick):
+                item_id = int(match.group(1))
+                if item_id in wanted:
+                    values[item_id] = _property_value(match.group(2).decode("ascii"),
+                                                      parse_arguments(_text(match.group(3))))
+
+        definitions = {}
+        for definition_id in definition_ids:
+            properties = dict(values[item_id] for item_id in self.definition_items[definition_id]
+                              if item_id in values)
+            properties["id"] = definition_id
+            definitions[definition_id] = properties
+        return definitions
+
+    def _merged(self, element_id: int, definitions: Dict[int, dict]) -> Dict[str, dict]:
+        """Pset name -> properties of an element, later definitions overriding earlier ones like get_psets"""
+        psets = {}
+        for definition_id in self.element_definitions.get(element_id, ()):
+            properties = definitions.get(definition_id)
+            if properties is not None:
+                name = self.definition_names[definition_id]
+                psets[name] = {**psets[name], **properties} if name in psets else properties
+        return psets
+
+    def iter_parameters(self, category: Optional[str], pset: str, psets: Optional[List[str]] = None,
+                        token: CancelToken = None, chunk_size: int = None
+                        ) -> Iterator[Tuple[List[str], PropertyTable]]:
+        """Same chunks as OptimizedIFCDataProcessor.iter_parameters (iter_psets_parameters with several psets).
+
+        category None selects every element carrying pset, like the pset-first mode. The values are read
+        by one pass over the file, the rows are then yielded chunk by chunk.
+        """
+        token = token or CancelToken()
+        chunk_size = chunk_size or OptimizedIFCDataProcessor.CHUNK_SIZE
+        multi = bool(psets and len(psets) > 1)
+        wanted = set(psets) if multi else {pset}
+        try:
+            element_ids = self.pset_elements(pset) if category is None else self.category_elements(category)
+            if not element_ids:
+                return
+
+            definition_ids = {definition_id for element_id in element_ids
+                              for definition_id in self.element_definitions.get(element_id, ())
+                              if self.definition_names[definition_id] in wanted}
+            definitions = self.read_definitions(definition_ids, token)
+            element_psets = [self._merged(element_id, definitions) for element_id in element_ids]
+
+            names = {}
+            for psets_data in element_psets:
+                for name, properties in psets_data.items():
+                    names.setdefault(name, set()).update(properties)
+            if multi:
+                param_keys, param_names = OptimizedIFCDataProcessor.multi_pset_keys(names)
+                columns = OptimizedIFCDataProcessor.multi_pset_column_names(param_names)
+            else:
+                param_names = sorted(names.get(pset, ()))
+                columns = OptimizedIFCDataProcessor.column_names(param_names)
+
+            token.total = len(element_ids)
+            rows = []
+            limit = min(OptimizedIFCDataProcessor.FIRST_CHUNK_SIZE, chunk_size)
+            for index, (element_id, psets_data) in enumerate(zip(element_ids, element_psets), start=1):
+                if multi:
+                    rows.append(OptimizedIFCDataProcessor._build_multi_pset_row(index, element_id, psets_data,
+                                                                                param_keys, self))
+                else:
+                    rows.append(OptimizedIFCDataProcessor._build_row(index, element_id, pset, psets_data.get(pset),
+                                                                     param_names, self))
+                if len(rows) >= limit:
+                    token.tick(index)
+                    yield param_names, PropertyTable.from_rows(columns, rows)
+                    rows = []
+                    limit = chunk_size
+
+            if rows:
+                yield param_names, PropertyTable.from_rows(columns, rows)
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Error extracting parameters: {str(e)}")
@@ -37,9 +37,14 @@ class InfoModal(ModalScreen):
           j / ↓ — Move down  
           k / ↑ — Move up   
           l / ENTER — Select
+          space — Mark Pset (l on a marked Pset shows all marked side by side)
+          s — Switch IFC Categories to all Psets of the model (pset-first)
 
         Exporting
-         e - Export IFC data to xlsx
+         e - Export IFC data (xlsx by default)
+         x - Choose format: xlsx, csv, jsonl, npz
+         w - Export the whole model to one workbook
+         c - Cancel running export
          p - Expand IFCProperty tab
 
         Additional
@@ -0,0 +1,60 @@
+from textual.screen import ModalScreen
+from textual.widgets import OptionList, Label, Rule
+from textual.widgets.option_list import Option
+from textual.containers import Vertical
+from textual.app import ComposeResult
+from exporters import EXPORTERS
+
+
+class ExportFormatModal(ModalScreen):
+    """Picks the export format, remembers it as the default and returns it to the caller"""
+
+    BINDINGS = [("escape", "close_modal", "Close"),
+                ("q", "close_modal", "Close"),
+                ("x", "close_modal", "Close"),
+                ("j", "move_down", "Move Down"),
+                ("k", "move_up", "Move Up"),
+                ("l", "apply_format", "Export"),
+                ("enter", "apply_format", "Export"), ]
+
+    def __init__(self):
+        super().__init__()
+        self.formats = list(EXPORTERS)
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="export-box"):
+            yield Label("Export Format", id="export-title")
+            yield Label(f"Current: {self.app.config_manager.get_export_format()}", id="current-format")
+            yield Rule()
+            yield OptionList(*(Option(f"{name:<6} {EXPORTERS[name].description}", id=name) for name in self.formats),
+                             id="export-options")
+
+    def on_mount(self) -> None:
+        option_list = self.query_one(OptionList)
+        option_list.focus()
+
+        current_format = self.app.config_manager.get_export_format()
+        option_list.highlighted = self.formats.index(current_format) if current_format in self.formats else 0
+
+    def on_option_list_option_selected(
+            self, event: OptionList.OptionSelected
+    ) -> None:
+        self._apply(event.option.id)
+
+    def _apply(self, export_format: str) -> None:
+        self.app.config_manager.set_export_format(export_format)
+        self.dismiss(export_format)
+
+    def action_close_modal(self) -> None:
+        self.dismiss(None)
+
+    def action_apply_format(self) -> None:
+        highlighted_index = self.query_one(OptionList).highlighted
+        if highlighted_index is not None and 0 <= highlighted_index < len(self.formats):
+            self._apply(self.formats[highlighted_index])
+
+    def action_move_down(self) -> None:
+        self.query_one(OptionList).action_cursor_down()
+
+    def action_move_up(self) -> None:
+        self.query_one(OptionList).action_cursor_up()
@@ -1,11 +1,16 @@
-import os
+import time
+from contextlib import aclosing
+
 from textual.widgets import DataTable
 from textual.widget import Widget
 from textual.app import ComposeResult
 from textual.message import Message
 from textual.binding import Binding
-from ._logbox import LogBox
+from ._logbox import LogBox, ERROR
 from ._statusBar import StatusWidget
+from folder_scanner import FileEntry, FolderScanner, HeaderSummaries
+from folder_watcher import FolderChanges, FolderWatcher
+from job_manager import JobCancelled
 
 
 class BrowserWidget(Widget):
@@ -13,12 +18,36 @@ class BrowserWidget(Widget):
         Binding("j", "move_down", "Move Down"),
         Binding("k", "move_up", "Move Up"),
         Binding("l", "select_file", "Select File"),
+        Binding("r", "refresh_files", "Refresh Files"),
+        Binding("s", "toggle_subfolders", "Include Subfolders"),
     ]
     class FileSelected(Message):
         def __init__(self, filename: str):
             self.filename = filename
             super().__init__()
 
+    class FilesChanged(Message):
+        """Posted from the watcher thread; the app sees it after the rows have been updated"""
+        def __init__(self, changes: FolderChanges, watcher: FolderWatcher):
+            self.changes = changes
+            self.watcher = watcher
+            super().__init__()
+
+    def __init__(self, *args, recursive: bool = False, watch: str = "auto", poll_interval: float = 2.0,
+                 summaries: HeaderSummaries = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Listings of the current folder and its subfolders, reused while a directory is unchanged
+        self.scanner = FolderScanner()
+        # Schema, application, save time and entity count columns, filled in after the listing
+        self.summaries = summaries or HeaderSummaries()
+        self._pending_summaries = {}
+        self._summary_task = None
+        self.recursive = recursive
+        # Folder watching after every scan: auto, inotify, poll or off, see folder_watcher.py
+        self.watch = watch
+        self.poll_interval = poll_interval
+        self.watcher = None
+
     def compose(self) -> ComposeResult:
         self.table = DataTable()
         yield self.table
@@ -28,28 +57,167 @@ class BrowserWidget(Widget):
         table = self.query_one(DataTable)
         table.cursor_type = "row"
         # table.add_columns("Name", "Size,MB", "Status")  # Add Size column
-        table.add_columns("Name", "Size,MB")
+        table.add_column("Name", key="name")
+        table.add_column("Size,MB", key="size")
+        table.add_column("Schema", key="schema")
+        table.add_column("Application", key="application")
+        table.add_column("Saved", key="saved")
+        table.add_column("Entities", key="entities")
+        self.table.focus()
+        self.scan_files()
 
-        files = os.listdir("./")
+    def scan_files(self) -> None:
+        """Lists the folder again in the background, the rows arrive in batches"""
+        self._stop_watcher()
+        self.app.jobs.cancel("headers")
+        self._pending_summaries.clear()
+        self.app.jobs.spawn("browser", self._scan_files())
 
-        sorted_ifc_files = sorted(
-            [f for f in files if f.lower().endswith(".ifc")],
-            key=lambda x: x.lower()  # Alphabetical order
-        )
+    async def _scan_files(self) -> None:
+        log_box = self.app.query_one(LogBox)
+        table = self.table
+        selected = self._cursor_key()
+        table.clear()
+        start_time = time.perf_counter()
+        files = []
 
-        for filename in sorted_ifc_files:
-            file_name, file_extension = os.path.splitext(filename)
-            #file_format = file_extension[1:] if file_extension else "N/A"
+        try:
+            batches = self.app.jobs.stream("browser", "Scanning folder", self.scanner.scan, ".",
+                                           recursive=self.recursive)
+            async with aclosing(batches):
+                async for batch in batches:
+                    for file_entry in batch:
+                        self._add_file_row(file_entry)
+                    files.extend(batch)
+        except JobCancelled:
+            return
+        except OSError as e:
+            log_box.log(f"File Browser: Cannot read folder: {str(e)}", ERROR)
+            self.app.query_one(StatusWidget).log(f"[--] Cannot read folder: {str(e)}")
+            return
 
-            # Calculate file size in MB if it's a file
-            if os.path.isfile(filename):
-                file_size_mb = os.path.getsize(filename) / (1024 * 1024)  # Convert bytes to MB
-            else:
-                file_size_mb = 0.0
+        # Streamed in listing order, sorted alphabetically once complete
+        self._sort_rows(selected)
+        where = "the folder and its subfolders" if self.recursive else "the folder"
+        log_box.log(f"File Browser: {len(files)} IFC files in {where} listed in "
+                    f"{time.perf_counter() - start_time:.2f} seconds")
+        self.app.query_one(StatusWidget).log(f"[OK] {len(files)} IFC files in {where}")
+        self._request_summaries(files)
 
-            # table.add_row(filename, f"{file_size_mb:.2f}", "-", key=filename)
-            table.add_row(filename, f"{file_size_mb:.2f}", key=filename)
-        self.table.focus()
+        if self.watch != "off":
+            # Changes carry the watcher that found them, self.watcher may be replaced or gone by then
+            watcher = FolderWatcher(self.scanner, lambda changes: self._post_changes(watcher, changes), ".",
+                                    recursive=self.recursive, mode=self.watch, poll_interval=self.poll_interval)
+            self.watcher = watcher
+            watcher.start(files)
+            log_box.debug(f"File Browser: Watching the folder ({watcher.mode})")
+
+    def _post_changes(self, watcher: FolderWatcher, changes: FolderChanges) -> None:
+        # Called in the watcher thread, post_message is thread-safe
+        self.post_message(self.FilesChanged(changes, watcher))
+
+    def _stop_watcher(self) -> None:
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def on_unmount(self) -> None:
+        self._stop_watcher()
+
+    def on_browser_widget_files_changed(self, message: FilesChanged) -> None:
+        """Applies the changes to the rows in place, the cursor stays on its file"""
+        if message.watcher is not self.watcher:
+            # From a watcher stopped by a new scan, which lists the folder anyway
+            return
+        table = self.table
+        changes = message.changes
+        selected = self._cursor_key()
+
+        for path in changes.removed:
+            self._pending_summaries.pop(path, None)
+            if path in table.rows:
+                table.remove_row(path)
+        for file_entry in changes.changed:
+            if file_entry.path in table.rows:
+                table.update_cell(file_entry.path, "size", self._size_text(file_entry))
+        for file_entry in changes.added:
+            if file_entry.path not in table.rows:
+                self._add_file_row(file_entry)
+        if changes.added:
+            self._sort_rows(selected)
+        self._request_summaries(changes.added + changes.changed)
+
+        self.app.query_one(LogBox).log(f"File Browser: {len(changes.added)} added, {len(changes.removed)} removed, "
+                                       f"{len(changes.changed)} changed on disk")
+
+    def _add_file_row(self, file_entry: FileEntry) -> None:
+        self.table.add_row(file_entry.path, self._size_text(file_entry), "", "", "", "", key=file_entry.path)
+
+    @staticmethod
+    def _size_text(file_entry: FileEntry) -> str:
+        return f"{file_entry.size / (1024 * 1024):.2f}"
+
+    def _request_summaries(self, file_entries: list) -> None:
+        """Queues files for the header columns; one flow works through the queue, later files join it"""
+        self._pending_summaries.update((file_entry.path, file_entry) for file_entry in file_entries)
+        if self._pending_summaries and (self._summary_task is None or self._summary_task.done()):
+            self._summary_task = self.app.jobs.spawn("headers", self._load_summaries())
+
+    async def _load_summaries(self) -> None:
+        start_time = time.perf_counter()
+        count = 0
+        while self._pending_summaries:
+            file_entries = list(self._pending_summaries.values())
+            self._pending_summaries.clear()
+            try:
+                batches = self.app.jobs.stream("headers", None, self.summaries.compute, file_entries, ".")
+                async with aclosing(batches):
+                    async for batch in batches:
+                        for path, summary in batch:
+                            if path in self.table.rows:
+                                self._show_summary(path, summary)
+                        count += len(batch)
+            except JobCancelled:
+                return
+        self.app.query_one(LogBox).debug(f"File Browser: Headers of {count} files read in "
+                                         f"{time.perf_counter() - start_time:.2f} seconds")
+
+    def _show_summary(self, path: str, summary: dict) -> None:
+        if summary is None:
+            cells = {"schema": "?", "application": "", "saved": "", "entities": ""}
+        else:
+            entities = summary.get("entities") or 0
+            cells = {
+                "schema": summary.get("schema") or "",
+                # Long names such as "Autodesk Revit 2024 (ENU)" would take the whole pane
+                "application": (summary.get("originating_system") or "")[:24],
+                "saved": (summary.get("timestamp") or "")[:16].replace("T", " "),
+                "entities": f"{entities:,}" if summary.get("exact") else f"~{entities:,}",
+            }
+        for column, value in cells.items():
+            self.table.update_cell(path, column, value)
+
+    def _sort_rows(self, selected=None) -> None:
+        self.table.sort("name", key=str.lower)
+        if selected is not None and selected in self.table.rows:
+            self.table.move_cursor(row=self.table.get_row_index(selected))
+
+    def _cursor_key(self):
+        if not self.table.row_count:
+            return None
+        return self.table.coordinate_to_cell_key(self.table.cursor_coordinate).row_key
+
+    def action_refresh_files(self) -> None:
+        # An explicit refresh reads every directory again, also to pick up files rewritten in place
+        self.scanner.forget(".")
+        self.scan_files()
+
+    def action_toggle_subfolders(self) -> None:
+        self.recursive = not self.recursive
+        self.app.config_manager.set_browser_recursive(self.recursive)
+        self.app.query_one(StatusWidget).log(
+            f"[~~~] Subfolders {'included in' if self.recursive else 'excluded from'} the file list")
+        self.scan_files()
 
     def action_move_down(self) -> None:
         if self.table.row_count > 0:
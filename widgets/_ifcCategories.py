@@ -3,7 +3,7 @@ from textual.widget import Widget
 from textual.app import ComposeResult
 from textual.widgets import DataTable, Label
 from textual.binding import Binding
-from ._logbox import LogBox
+from ._logbox import LogBox, ERROR
 from ._statusBar import StatusWidget
 
 
@@ -12,16 +12,42 @@ class CategoryWidget(Widget):
         Binding("j", "move_down", "Move Down"),
         Binding("k", "move_up", "Move Up"),
         Binding("l", "select_category", "Select Category"),
+        Binding("s", "toggle_pset_mode", "Switch between categories and psets"),
     ]
 
+    # Label of the selection in pset-first mode, used in place of a category
+    ALL_CATEGORIES = "All categories"
+    CATEGORY_TITLE = r"IfcCategories \[2]"
+    PSET_TITLE = r"IfcPsets, all categories \[2]"
+    # Quick scrolling past a row does not start any speculative work
+    HIGHLIGHT_DELAY = 0.4
+
     class CategorySelected(Message):
         def __init__(self, category: str) -> None:
             super().__init__()
             self.category = category
 
+    class CategoryHighlighted(Message):
+        """The cursor has rested on a category for HIGHLIGHT_DELAY seconds"""
+
+        def __init__(self, category: str) -> None:
+            super().__init__()
+            self.category = category
+
+    class PsetSelected(Message):
+        """A pset chosen in pset-first mode, to be extracted for every element carrying it"""
+
+        def __init__(self, pset: str) -> None:
+            super().__init__()
+            self.pset = pset
+
     def __init__(self) -> None:
         super().__init__()
         self.ifc_file = None
+        self.categories = None
+        self.pset_counts = None
+        self.pset_mode = False
+        self._highlight_timer = None
         self.message_label = Label("Please, select IfcFile", classes="warning")
 
     def compose(self) -> ComposeResult:
@@ -41,7 +67,7 @@ class CategoryWidget(Widget):
 
     def update_view(self) -> None:
         """Update visibility of the DataTable and Label based on the presence of an IFC file."""
-        if self.ifc_file:
+        if self.ifc_file or self.categories:
             self.message_label.display = False
             self.table.display = True
         else:
@@ -69,9 +95,38 @@ class CategoryWidget(Widget):
 
     def handle_category_selection(self, category: str) -> None:
         log_box = self.app.query_one(LogBox)
-        log_box.log(f"CategoryWidget: Category selected: {category}")
+        if self.pset_mode:
+            log_box.debug(f"CategoryWidget: Pset selected across categories: {category}")
+            self.post_message(self.PsetSelected(category))
+            return
+        log_box.debug(f"CategoryWidget: Category selected: {category}")
         self.post_message(self.CategorySelected(category))
 
+    def action_toggle_pset_mode(self) -> None:
+        """Switches the list between IFC classes and the psets of the whole model"""
+        if not self.pset_mode and self.pset_counts is None:
+            self.app.query_one(StatusWidget).log("[~~~] Pset list is available once the model has been indexed")
+            return
+
+        self.pset_mode = not self.pset_mode
+        table = self.query_one(DataTable)
+        table.clear(columns=True)
+        if self.pset_mode:
+            table.add_columns("No", "Pset Name", "Elements")
+            self.border_title = self.PSET_TITLE
+            self._fill_table(self.pset_counts)
+        else:
+            table.add_columns("No", "Ifc Category", "Amount")
+            self.border_title = self.CATEGORY_TITLE
+            self._fill_table(self.categories or {})
+        self.app.query_one(LogBox).debug(f"CategoryWidget: Pset-first mode {'on' if self.pset_mode else 'off'}")
+
+    def _fill_table(self, counts: dict, approximate: bool = False) -> None:
+        table = self.query_one(DataTable)
+        sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        for i, (name, amount) in enumerate(sorted_counts, start=1):
+            table.add_row(str(i), name, f"~{amount}" if approximate else str(amount))
+
     def on_focus(self) -> None:
         self.add_class("focus")
         self.table.focus()
@@ -79,11 +134,34 @@ class CategoryWidget(Widget):
     def on_blur(self):
         self.remove_class("focus")
 
-    def update_categories(self, ifc_file, filename) -> None:
+    @staticmethod
+    def count_categories(ifc_file) -> dict:
+        """Counts IfcElement instances per IFC class"""
+        categories = {}
+        for product in ifc_file.by_type("IfcElement"):
+            entity_type = product.is_a()
+            if entity_type not in categories:
+                categories[entity_type] = 0
+            categories[entity_type] += 1
+        return categories
+
+    def update_categories(self, ifc_file, filename, categories: dict = None, approximate: bool = False,
+                          pset_counts: dict = None) -> None:
+        """Fills the table from the opened file, or from precomputed counts (index cache or preview scan)"""
         self.ifc_file = ifc_file
+        self.categories = categories
+        self.pset_counts = pset_counts
         self.update_view()
 
-        if not ifc_file and not filename:
+        if self.pset_mode:
+            # A new model always opens on its categories
+            self.pset_mode = False
+            table = self.query_one(DataTable)
+            table.clear(columns=True)
+            table.add_columns("No", "Ifc Category", "Amount")
+            self.border_title = self.CATEGORY_TITLE
+
+        if not ifc_file and not filename and categories is None:
             return
 
         table = self.query_one(DataTable)
@@ -91,21 +169,17 @@ class CategoryWidget(Widget):
         log_box = self.app.query_one(LogBox)
 
         try:
-            log_box.log("Processing IFC file for categories")
-            products = ifc_file.by_type("IfcElement")
-            categories = {}
-
-            for product in products:
-                entity_type = product.is_a()
-                if entity_type not in categories:
-                    categories[entity_type] = 0
-                categories[entity_type] += 1
+            if categories is None:
+                log_box.log("Processing IFC file for categories")
+                categories = self.count_categories(ifc_file)
+                self.categories = categories
 
             log_box.log(f"Found {len(categories)} IfcProduct-related categories")
-            sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
+            self._fill_table(categories, approximate)
 
-            for i, (category, amount) in enumerate(sorted_categories, start=1):
-                table.add_row(str(i), category, str(amount))
+            if approximate:
+                log_box.log("Categories table filled with preview counts")
+                return
 
             log_box.log("Categories table updated")
 
@@ -114,9 +188,19 @@ class CategoryWidget(Widget):
         except Exception as e:
             error_message = f"Error processing IFC file: {str(e)}"
             table.add_row("Error", error_message, "")
-            log_box.log(error_message)
+            log_box.log(error_message, ERROR)
             self.app.query_one(StatusWidget).log(f"[---] Error during opening IFC file {filename}")
 
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if self._highlight_timer is not None:
+            self._highlight_timer.stop()
+        if self.pset_mode or not self.categories or event.cursor_row < 0:
+            return
+        category = self.table.get_row_at(event.cursor_row)[1]
+        if category in self.categories:
+            self._highlight_timer = self.set_timer(
+                self.HIGHLIGHT_DELAY, lambda: self.post_message(self.CategoryHighlighted(category)))
+
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         if event.row_key is not None:
             category = self.table.get_row_at(event.cursor_row)[1]
@@ -13,6 +13,8 @@ class IfcInfoWidget(Widget):
         self.size_label = Static("File Size: -")
         self.version_label = Static("IFC Version: -")
         self.elements_label = Static("Number of Elements: -")
+        self.tool_label = Static("Authoring Tool: -")
+        self.timestamp_label = Static("Timestamp: -")
 
     def compose(self) -> ComposeResult:
         """Compose the widget layout."""
@@ -21,16 +23,26 @@ class IfcInfoWidget(Widget):
         yield self.size_label
         yield self.version_label
         yield self.elements_label
+        yield self.tool_label
+        yield self.timestamp_label
 
-    def update_info(self, ifc_file, filename):
-        """Update the IFC info widget with data from the opened file."""
+    def update_info(self, ifc_file, filename, schema: str = None, num_elements: int = None,
+                    header: dict = None, approximate: bool = False):
+        """Update the IFC info widget with data from the opened file (or from a cached summary or a preview scan)."""
         ifc_name = os.path.basename(filename) if filename else "-"
         ifc_size = f"{os.path.getsize(filename) / (1024 * 1024):.2f} MB" if filename else "-"
-        ifc_version = ifc_file.schema if ifc_file else "-"
-        num_elements = len(ifc_file.by_type("IfcProduct")) if ifc_file else "-"
+        if schema is None:
+            schema = ifc_file.schema if ifc_file else "-"
+        if num_elements is None:
+            num_elements = len(ifc_file.by_type("IfcProduct")) if ifc_file else "-"
+        elif approximate:
+            num_elements = f"~{num_elements} (preview)"
+        header = header or {}
 
         # Update labels with detailed information
         self.name_label.update(f"Name: {ifc_name}")
         self.size_label.update(f"File Size: {ifc_size}")
-        self.version_label.update(f"IFC Version: {ifc_version}")
+        self.version_label.update(f"IFC Version: {schema}")
         self.elements_label.update(f"Number of Elements: {num_elements}")
+        self.tool_label.update(f"Authoring Tool: {header.get('originating_system') or '-'}")
+        self.timestamp_label.update(f"Timestamp: {header.get('timestamp') or '-'}")
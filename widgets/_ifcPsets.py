@@ -4,31 +4,44 @@ from textual.app import ComposeResult
 from textual.message import Message
 from textual.binding import Binding
 
-import ifcopenshell
-import ifcopenshell.util.element
-
 from ._logbox import LogBox
 from ._statusBar import StatusWidget
 
-import asyncio
-import time
-
 
 class PsetWidget(Widget):
     BINDINGS = [
         Binding("j", "move_down", "Move Down"),
         Binding("k", "move_up", "Move Up"),
         Binding("l", "select_pset", "Select Pset"),
+        Binding("space", "toggle_mark", "Mark Pset"),
     ]
 
+    ALL_PSETS = "All psets"
+    MARK = "✓"
+    HIGHLIGHT_DELAY = 0.4
+
+    class PsetHighlighted(Message):
+        """The cursor has rested on a single pset for HIGHLIGHT_DELAY seconds"""
+
+        def __init__(self, category: str, pset: str) -> None:
+            super().__init__()
+            self.category = category
+            self.pset = pset
+
     class PsetSelected(Message):
-        def __init__(self, pset: str) -> None:
+        """pset is the label of the selection, psets the names to show side by side (just pset by default)"""
+
+        def __init__(self, pset: str, psets: list = None) -> None:
             super().__init__()
             self.pset = pset
+            self.psets = psets or [pset]
 
     def __init__(self) -> None:
         super().__init__()
         self.category = None
+        self.psets = []
+        self.marked = set()
+        self._highlight_timer = None
         self.message_label = Label("Please, select IfcCategory", classes="warning")
 
     def compose(self) -> ComposeResult:
@@ -39,7 +52,7 @@ class PsetWidget(Widget):
     def on_mount(self) -> None:
         table = self.query_one(DataTable)
         table.cursor_type = "row"
-        table.add_columns("No", "Pset Name")
+        self.no_column, _ = table.add_columns("No", "Pset Name")
 
         table.styles.scrollbar_gutter = "stable"
         table.styles.overflow_y = "auto"
@@ -74,10 +87,39 @@ class PsetWidget(Widget):
                 pset = selected_row[1]
                 self.handle_pset_selection(pset)
 
+    def action_toggle_mark(self) -> None:
+        """Marks or unmarks the Pset under the cursor; selecting then shows all marked Psets side by side"""
+        if self.table.row_count == 0:
+            return
+        pset = self.table.get_row_at(self.table.cursor_row)[1]
+        if pset not in self.psets:
+            return
+
+        if pset in self.marked:
+            self.marked.discard(pset)
+            self.table.update_cell(pset, self.no_column, str(self.psets.index(pset) + 1))
+        else:
+            self.marked.add(pset)
+            self.table.update_cell(pset, self.no_column, self.MARK)
+
     def handle_pset_selection(self, pset: str) -> None:
         log_box = self.app.query_one(LogBox)
-        log_box.log(f"PsetWidget: Pset selected: {pset}")
-        self.post_message(self.PsetSelected(pset))
+        if pset == self.ALL_PSETS:
+            psets = list(self.psets)
+        elif self.marked:
+            psets = [name for name in self.psets if name in self.marked or name == pset]
+        else:
+            psets = [pset]
+
+        if len(psets) > 1:
+            label = self.ALL_PSETS if len(psets) == len(self.psets) else " + ".join(psets)
+            if len(label) > 60:
+                label = f"{len(psets)} psets"
+        else:
+            label = psets[0]
+
+        log_box.debug(f"PsetWidget: Pset selected: {label}")
+        self.post_message(self.PsetSelected(label, psets))
 
     def on_focus(self) -> None:
         self.add_class("focus")
@@ -86,92 +128,36 @@ class PsetWidget(Widget):
     def on_blur(self):
         self.remove_class("focus")
 
-    async def update_psets(self, ifc_file, category: str) -> None:
+    def show_psets(self, category: str, psets: list, source: str = "index cache") -> None:
+        """Fills the table with already known Pset names (from the index cache or the property index)"""
         self.category = category
-        #self.update_view()
-
-        if not category:
-            return
-
+        self.psets = list(psets)
+        self.marked = set()
         table = self.query_one(DataTable)
         table.clear()
-        log_box = self.app.query_one(LogBox)
-        status_widget = self.app.query_one(StatusWidget)
-
-        log_box.log(f"PsetWidget: Updating Psets for category: {category}")
-        status_widget.log(f"[~~~] Updating Psets for {category}... [0.0 sec]")
-
-        start_time = time.perf_counter()
-
-        def fetch_psets():
-            try:
-                elements = ifc_file.by_type(category)
-                log_box.log(f"PsetWidget: Found {len(elements)} elements of type {category}")
-                psets = set()
-
-                for element in elements:
-                    # Property Sets
-                    element_psets = ifcopenshell.util.element.get_psets(element, psets_only=True)
-                    psets.update(element_psets.keys())
-
-                    # Quantity Sets
-                    element_qtos = ifcopenshell.util.element.get_psets(element, qtos_only=True)
-                    psets.update(element_qtos.keys())
-
-                    all_element_sets = list(element_psets.keys()) + list(element_qtos.keys())
-                    log_box.log(f"PsetWidget: Element {element.id()} has Psets/QSets: {all_element_sets}")
-
-                self.update_view()
-                return sorted(psets)
-
-                #     for rel in getattr(element, 'IsDefinedBy', []):
-                #         if rel.is_a('IfcRelDefinesByProperties'):
-                #             property_definition = rel.RelatingPropertyDefinition
-                #             if (property_definition.is_a('IfcPropertySet') or
-                #                     property_definition.is_a('IfcElementQuantity')):
-                #                 pset_name = property_definition.Name
-                #                 if pset_name:
-                #                     psets.add(pset_name)
-                #                     pset_type = "IfcElementQuantity" if property_definition.is_a(
-                #                         'IfcElementQuantity') else "IfcPropertySet"
-                #                     log_box.log(f"PsetWidget: Element {element.id()} has {pset_type}: {pset_name}")
-                #
-                #     self.update_view()
-                #     return sorted(psets)
-                # return None
-
-            except Exception as e:
-                error_message = f"PsetWidget: Error fetching Psets: {str(e)}"
-                log_box.log(error_message)
-                self.app.query_one(StatusWidget).log(f"[---] Error during processing Psets from {category}")
-                return []
-
-        # Run the fetch_psets function in a background thread
-        psets_task = asyncio.create_task(asyncio.to_thread(fetch_psets))
-
-        # Update the timer while the task is running
-        async def update_timer():
-            while not psets_task.done():
-                elapsed_time = time.perf_counter() - start_time
-                status_widget.log(f"[~~~] Updating Psets for {category}... [{elapsed_time:.1f} sec]")
-                await asyncio.sleep(0.5)
-
-        await asyncio.gather(psets_task, update_timer())
-
-        elapsed_time = time.perf_counter() - start_time
-        sorted_psets = psets_task.result()
-
-        if sorted_psets:
-            for i, pset_name in enumerate(sorted_psets, start=1):
-                table.add_row(str(i), pset_name)
-
-            log_box.log(f"PsetWidget: Added {len(sorted_psets)} unique Psets to the table")
-            status_widget.log(f"[+++] Psets from {category} added to the table in {elapsed_time:.2f} seconds")
-        else:
+
+        if len(psets) > 1:
+            table.add_row("*", self.ALL_PSETS, key=self.ALL_PSETS)
+        for i, pset_name in enumerate(psets, start=1):
+            table.add_row(str(i), pset_name, key=pset_name)
+        if not psets:
             table.add_row("Error", "Failed to fetch Psets")
-            status_widget.log(f"[---] Failed to add Psets for {category}")
 
-        log_box.log(f"PsetWidget: Completed update for {category} in {elapsed_time:.2f} seconds")
+        self.update_view()
+        self.app.query_one(LogBox).log(f"PsetWidget: Added {len(psets)} Psets for {category} from {source}")
+        self.app.query_one(StatusWidget).log(f"[+++] Psets from {category} loaded from {source}")
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if self._highlight_timer is not None:
+            self._highlight_timer.stop()
+        if not self.category or event.cursor_row < 0:
+            return
+        pset = self.table.get_row_at(event.cursor_row)[1]
+        # The combined view of all psets is too big to prepare on speculation
+        if pset in self.psets:
+            category = self.category
+            self._highlight_timer = self.set_timer(
+                self.HIGHLIGHT_DELAY, lambda: self.post_message(self.PsetHighlighted(category, pset)))
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         if event.row_key is not None:
@@ -1,19 +1,89 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
 from textual.widgets import RichLog
 from textual.widget import Widget
 from textual.app import ComposeResult
 
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+
 class LogBox(Widget):
-    def __init__(self):
+    """Log panel fed through a queue: producers on any thread only enqueue, a timer writes batches"""
+
+    def __init__(self, level: int = INFO, max_lines: int = 2000, flush_interval: float = 0.1,
+                 max_batch: int = 500, log_file: str = None, file_level: int = DEBUG):
         super().__init__()
-        self.log_content = RichLog()
+        self.level = level
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.log_content = RichLog(max_lines=max_lines)
+        self._queue = queue.SimpleQueue()
+
+        # Optional spill of every record to a rotating file, written by a listener thread
+        self._file_logger = None
+        self._file_listener = None
+        self.file_level = file_level
+        if log_file:
+            self._start_file_logging(log_file)
+
+    def _start_file_logging(self, log_file: str) -> None:
+        file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(threadName)s: %(message)s"))
+
+        file_queue = queue.SimpleQueue()
+        self._file_listener = QueueListener(file_queue, file_handler)
+        self._file_listener.start()
+
+        self._file_logger = logging.getLogger("honeyifc")
+        self._file_logger.setLevel(self.file_level)
+        self._file_logger.propagate = False
+        self._file_logger.addHandler(QueueHandler(file_queue))
 
     def compose(self) -> ComposeResult:
         yield self.log_content
 
     def on_mount(self):
         self.log_content.write("Log messages will appear here...")
+        self.set_interval(self.flush_interval, self._flush)
 
-    def log(self, message: str):
-        self.log_content.write(message)
-        self.log_content.scroll_end(animate=False)
+    def on_unmount(self):
+        if self._file_listener:
+            self._file_listener.stop()
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Lets callers skip building expensive messages that would be dropped anyway"""
+        return level >= self.level or (self._file_logger is not None and level >= self.file_level)
+
+    def log(self, message: str, level: int = INFO):
+        """Thread-safe: only enqueues the record, the panel is updated by the flusher"""
+        if self._file_logger is not None and level >= self.file_level:
+            self._file_logger.log(level, message)
+        if level >= self.level:
+            self._queue.put(message)
+
+    def debug(self, message: str):
+        self.log(message, DEBUG)
 
+    def _flush(self) -> None:
+        """Writes queued records as one batch; a backlog over max_batch is summarized instead of rendered"""
+        messages = []
+        try:
+            while True:
+                messages.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if not messages:
+            return
+
+        if len(messages) > self.max_batch:
+            skipped = len(messages) - self.max_batch
+            messages = [f"... {skipped} log messages skipped ..."] + messages[-self.max_batch:]
+
+        self.log_content.write("\n".join(messages))
+        self.log_content.scroll_end(animate=False)
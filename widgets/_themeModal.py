@@ -3,7 +3,6 @@ from textual.widgets import OptionList, Label, Rule
 from textual.widgets.option_list import Option
 from textual.containers import Vertical
 from textual.app import ComposeResult
-from config_manager import ConfigManager
 
 
 class ThemeSelectorModal(ModalScreen):
@@ -29,8 +28,6 @@ class ThemeSelectorModal(ModalScreen):
         super().__init__()
         self.original_theme = None
 
-        self.config_manager = ConfigManager("honeycomb")
-
     def compose(self) -> ComposeResult:
         with Vertical(id="theme-box"):
             yield Label("Choose Theme", id="theme-title")
@@ -62,7 +59,7 @@ class ThemeSelectorModal(ModalScreen):
             self, event: OptionList.OptionSelected
     ) -> None:
         self.app.theme = event.option.prompt
-        self.config_manager.set_theme(event.option.prompt)
+        self.app.config_manager.set_theme(event.option.prompt)
         self.app.pop_screen()
 
     def action_close_modal(self) -> None:
@@ -79,7 +76,7 @@ class ThemeSelectorModal(ModalScreen):
 
             selected_theme = self.THEMES[highlighted_index]
             self.app.theme = selected_theme
-            self.config_manager.set_theme(selected_theme)
+            self.app.config_manager.set_theme(selected_theme)
             self.app.pop_screen()
 
     def action_move_down(self) -> None:
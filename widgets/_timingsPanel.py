@@ -0,0 +1,71 @@
+from rich.table import Table
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.widget import Widget
+from textual.widgets import Static
+
+from op_timings import OperationTimings, STAGES, bucket_labels
+
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+class TimingsPanel(Widget):
+    """Per-stage operation timings with a duration histogram; redrawn only when a sample was added"""
+
+    def __init__(self, timings: OperationTimings, refresh_interval: float = 1.0):
+        super().__init__()
+        self.timings = timings
+        self.refresh_interval = refresh_interval
+        self.content = Static("")
+        self._shown_version = -1
+
+    def compose(self) -> ComposeResult:
+        yield self.content
+
+    def on_mount(self):
+        self.update_view()
+        self.set_interval(self.refresh_interval, self.update_view)
+
+    def update_view(self) -> None:
+        if not self.display or self.timings.version == self._shown_version:
+            return
+        self._shown_version = self.timings.version
+        self.content.update(self.build_table())
+
+    @staticmethod
+    def sparkline(counts: list) -> Text:
+        """One bar per bucket, scaled to the fullest; empty buckets stay blank"""
+        peak = max(counts)
+        text = Text()
+        for count in counts:
+            if not count:
+                text.append(" ")
+            else:
+                text.append(SPARK[(count * (len(SPARK) - 1)) // peak], style="bold")
+        return text
+
+    def build_table(self) -> Table:
+        labels = bucket_labels()
+        table = Table(expand=True, box=None, caption=f"Histogram buckets: {labels[0]} ... {labels[-1]}",
+                      caption_justify="left")
+        table.add_column("Stage")
+        for column in ("Count", "Last", "p50", "p90", "Max", "Elements", "Rows", "Peak RSS"):
+            table.add_column(column, justify="right")
+        table.add_column("Histogram")
+
+        def seconds(value) -> str:
+            return f"{value:.3f}s" if value is not None else "-"
+
+        def number(value) -> str:
+            return f"{value:,}" if value is not None else "-"
+
+        for stage in STAGES:
+            stats = self.timings.stats(stage)
+            if not stats["count"]:
+                table.add_row(stage, "0", *["-"] * 7, "")
+                continue
+            table.add_row(stage, str(stats["count"]), seconds(stats["last"]), seconds(stats["p50"]),
+                          seconds(stats["p90"]), seconds(stats["max"]), number(stats["elements"]),
+                          number(stats["rows"]), f"{stats['peak_rss_mb']:.0f} MB",
+                          self.sparkline(self.timings.histogram(stage)))
+        return table
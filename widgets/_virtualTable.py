@@ -0,0 +1,186 @@
+from typing import TYPE_CHECKING, List, Optional
+
+from rich.cells import cell_len, set_cell_size
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.events import Click
+from textual.geometry import Size
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+if TYPE_CHECKING:
+    from property_table import PropertyTable
+
+
+class VirtualTable(ScrollView, can_focus=True):
+    """Read-only table over a PropertyTable that only formats the rows and columns in view.
+
+    Unlike DataTable no per-row objects are created, so appending rows costs a chunk append and
+    rendering costs the same for a hundred rows as for a million.
+    """
+
+    COMPONENT_CLASSES = {
+        "virtualtable--header",
+        "virtualtable--cursor",
+    }
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Cursor Up", show=False),
+        Binding("down", "cursor_down", "Cursor Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "cursor_home", "First Row", show=False),
+        Binding("end", "cursor_end", "Last Row", show=False),
+        Binding("left", "scroll_left", "Scroll Left", show=False),
+        Binding("right", "scroll_right", "Scroll Right", show=False),
+    ]
+
+    # Column widths are measured on the first rows only, longer values are cut with an ellipsis
+    WIDTH_SAMPLE_ROWS = 1000
+    MAX_COLUMN_WIDTH = 40
+    CELL_PADDING = 1
+
+    cursor_row = reactive(0, always_update=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.columns: List[str] = []
+        # Created with the first rows: property_table imports NumPy, which the first frame does without
+        self._store: Optional["PropertyTable"] = None
+        self._widths: List[int] = []
+        self._offsets: List[int] = []
+
+    @property
+    def store(self) -> "PropertyTable":
+        if self._store is None:
+            from property_table import PropertyTable
+
+            self._store = PropertyTable(self.columns)
+        return self._store
+
+    @property
+    def row_count(self) -> int:
+        return 0 if self._store is None else len(self._store)
+
+    def clear(self, columns: bool = False) -> None:
+        self._store = None
+        if columns:
+            self.columns = []
+            self._widths = []
+        self._update_layout()
+        self.cursor_row = 0
+        self.scroll_to(0, 0, animate=False)
+
+    def add_columns(self, *labels: str) -> None:
+        self.columns.extend(str(label) for label in labels)
+        self._widths.extend(min(cell_len(str(label)), self.MAX_COLUMN_WIDTH) for label in labels)
+        self._update_layout()
+
+    def add_rows(self, rows: "PropertyTable") -> None:
+        """Appends a chunk to the store; only widths of the first WIDTH_SAMPLE_ROWS rows are measured"""
+        for row in rows.iter_rows(0, max(0, self.WIDTH_SAMPLE_ROWS - self.row_count)):
+            for column, value in enumerate(row[:len(self._widths)]):
+                width = cell_len(rows.format_value(value))
+                if width > self._widths[column]:
+                    self._widths[column] = min(width, self.MAX_COLUMN_WIDTH)
+
+        self.store.extend(rows)
+        self._update_layout()
+
+    def get_row_at(self, row_index: int) -> list:
+        return self.store.row(row_index)
+
+    def _update_layout(self) -> None:
+        offsets = []
+        x = 0
+        for width in self._widths:
+            offsets.append(x)
+            x += width + 2 * self.CELL_PADDING
+        self._offsets = offsets
+        # One extra line for the header, which stays on top while scrolling
+        self.virtual_size = Size(x, self.row_count + 1)
+        self.refresh()
+
+    def move_cursor(self, row: Optional[int] = None) -> None:
+        if row is not None and self.row_count:
+            self.cursor_row = max(0, min(row, self.row_count - 1))
+
+    def watch_cursor_row(self, row: int) -> None:
+        # Keep the cursor between the header and the bottom edge
+        visible_rows = max(1, self.scrollable_content_region.height - 1)
+        if row < self.scroll_y:
+            self.scroll_to(y=row, animate=False)
+        elif row >= self.scroll_y + visible_rows:
+            self.scroll_to(y=row - visible_rows + 1, animate=False)
+        self.refresh()
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(row=self.cursor_row - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(row=self.cursor_row + 1)
+
+    def action_page_up(self) -> None:
+        self.move_cursor(row=self.cursor_row - max(1, self.scrollable_content_region.height - 1))
+
+    def action_page_down(self) -> None:
+        self.move_cursor(row=self.cursor_row + max(1, self.scrollable_content_region.height - 1))
+
+    def action_cursor_home(self) -> None:
+        self.move_cursor(row=0)
+
+    def action_cursor_end(self) -> None:
+        self.move_cursor(row=self.row_count - 1)
+
+    def on_click(self, event: Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is not None and offset.y > 0:
+            self.move_cursor(row=self.scroll_offset.y + offset.y - 1)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        base_style = self.rich_style
+
+        if y == 0:
+            style = base_style + self.get_component_rich_style("virtualtable--header")
+            return self._render_cells(self.columns, scroll_x, width, style)
+
+        row_index = scroll_y + y - 1
+        if row_index >= self.row_count:
+            return Strip.blank(width, base_style)
+
+        style = base_style
+        if row_index == self.cursor_row:
+            style = base_style + self.get_component_rich_style("virtualtable--cursor")
+        return self._render_cells(self.store.row(row_index), scroll_x, width, style)
+
+    def _render_cells(self, values: list, scroll_x: int, width: int, style: Style) -> Strip:
+        """Formats only the cells that intersect the horizontal window [scroll_x, scroll_x + width)"""
+        segments = []
+        start = None
+        end = scroll_x + width
+        for column, (offset, column_width) in enumerate(zip(self._offsets, self._widths)):
+            cell_width = column_width + 2 * self.CELL_PADDING
+            if offset + cell_width <= scroll_x:
+                continue
+            if offset >= end:
+                break
+            if start is None:
+                start = offset
+
+            text = self.store.format_value(values[column]) if column < len(values) else ""
+            if cell_len(text) > column_width:
+                text = set_cell_size(text, column_width - 1) + "…"
+            else:
+                text = set_cell_size(text, column_width)
+            padding = " " * self.CELL_PADDING
+            segments.append(Segment(f"{padding}{text}{padding}", style))
+
+        if start is None:
+            return Strip.blank(width, style)
+
+        strip = Strip(segments)
+        return strip.crop_extend(scroll_x - start, end - start, style)